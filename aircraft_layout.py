@@ -0,0 +1,132 @@
+import json
+import os
+from array import array
+
+# Marks an aisle between seat groups in a cabin's "seats" list
+AISLE = "|"
+
+LAYOUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "layouts")
+DEFAULT_LAYOUT_PATH = os.path.join(LAYOUT_DIR, "burak757.json")
+
+
+class Cabin:
+    def __init__(self, name, first_row, last_row, columns, blocked=()):
+        self.name = name
+        self.rows = range(first_row, last_row + 1)
+        # Seat letters and AISLE markers, left to right
+        self.columns = list(columns)
+        self.blocked = set(blocked)
+
+    @property
+    def groups(self):
+        """Seat letters split at the aisles, e.g. [["A", "B"], ["C", "D"]]."""
+        groups = [[]]
+        for column in self.columns:
+            if column == AISLE:
+                groups.append([])
+            else:
+                groups[-1].append(column)
+        return [group for group in groups if group]
+
+
+class AircraftLayout:
+    """
+    Seat layout of an aircraft: cabins, row ranges, seat letters, aisles and blocked seats.
+
+    On construction every seat is numbered in cabin order and the following are
+    precomputed, so lookups never walk the cabin:
+      - seat_ids[i], and index[seat_id] -> i
+      - seat_rows[i] / seat_cols[i]: row number and seat letter
+      - grid_rows[i] / grid_cols[i]: cell of the seat in a seat-map grid where column 0
+        holds row labels and each cabin starts with a header row of seat letters
+    """
+    def __init__(self, name, cabins):
+        self.name = name
+        self.cabins = cabins
+        self.seat_ids = []
+        self.seat_cols = []
+        self.seat_rows = array("H")
+        self.grid_rows = array("H")
+        self.grid_cols = array("H")
+        # (grid_row, [(grid_col, text), ...]) for each cabin's header row
+        self.headers = []
+        # (grid_row, row_number) for each row label
+        self.row_labels = []
+        # Cabin of each row number
+        self.row_cabin = {}
+
+        grid_row = 0
+        for cabin in cabins:
+            self.headers.append((grid_row, [(c + 1, column) for c, column in enumerate(cabin.columns)
+                                            if column != AISLE]))
+            grid_row += 1
+            for row in cabin.rows:
+                self.row_cabin[row] = cabin
+                self.row_labels.append((grid_row, row))
+                for c, column in enumerate(cabin.columns):
+                    seat_id = f"{row}{column}"
+                    if column == AISLE or seat_id in cabin.blocked:
+                        continue
+                    self.seat_ids.append(seat_id)
+                    self.seat_cols.append(column)
+                    self.seat_rows.append(row)
+                    self.grid_rows.append(grid_row)
+                    self.grid_cols.append(c + 1)
+                grid_row += 1
+        self.index = {seat_id: i for i, seat_id in enumerate(self.seat_ids)}
+        # Compact description of the cabins; equal keys mean identical seats, whatever
+        # the size of the aircraft (see DatabaseManager.seed_seats)
+        self.key = json.dumps([name] + [[cabin.name, cabin.rows.start, cabin.rows.stop - 1,
+                                         cabin.columns, sorted(cabin.blocked)]
+                                        for cabin in cabins], separators=(",", ":"))
+        self.grid_height = grid_row
+        self.grid_width = 1 + max(len(cabin.columns) for cabin in cabins)
+
+    def __len__(self):
+        return len(self.seat_ids)
+
+    def __contains__(self, seat_id):
+        return seat_id in self.index
+
+    def seats(self):
+        """(seat_id, seat_row, seat_col) tuples, ready for DatabaseManager.insert_seats."""
+        return zip(self.seat_ids, self.seat_rows, self.seat_cols)
+
+    def position(self, seat_id):
+        """Grid (row, column) of a seat, or None if the layout has no such seat."""
+        i = self.index.get(seat_id)
+        if i is None:
+            return None
+        return self.grid_rows[i], self.grid_cols[i]
+
+    def aisle_columns(self):
+        """Grid columns that are aisles in at least one cabin."""
+        return sorted({c + 1 for cabin in self.cabins
+                       for c, column in enumerate(cabin.columns) if column == AISLE})
+
+    def groups(self, row):
+        """Seat groups of a row number (see Cabin.groups)."""
+        return self.row_cabin[row].groups
+
+
+def layout_from_dict(config):
+    cabins = [Cabin(cabin.get("name", ""), cabin["rows"][0], cabin["rows"][1],
+                    cabin["seats"], cabin.get("blocked", ()))
+              for cabin in config["cabins"]]
+    return AircraftLayout(config.get("name", ""), cabins)
+
+
+def layout_from_key(key):
+    """Rebuild the layout whose AircraftLayout.key this is (e.g. as stored by seed_seats)."""
+    name, *cabins = json.loads(key)
+    return AircraftLayout(name, [Cabin(*cabin) for cabin in cabins])
+
+
+def load_layout(path=DEFAULT_LAYOUT_PATH):
+    """Load a layout from a .json or .toml aircraft config file."""
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return layout_from_dict(tomllib.load(f))
+    with open(path) as f:
+        return layout_from_dict(json.load(f))
@@ -0,0 +1,66 @@
+"""
+Best-available seat search on a ~500-seat cabin at several load factors, using the
+incrementally maintained SeatAllocator and DatabaseManager.find_best_seats (which
+builds the flight's allocator once, then keeps it current from seat changes).
+"""
+import random
+import sys
+
+from aircraft_layout import layout_from_dict
+from database_manager import DatabaseManager
+from seat_allocator import SeatAllocator, rows_from_layout
+from benchmarks.common import cabin_layout_config, report, temp_db, timer
+
+
+def bench_allocator(layout, load_factor, n_queries=2000):
+    rng = random.Random(757)
+    booked = set(rng.sample(layout.seat_ids, int(len(layout) * load_factor)))
+    free = [seat_id for seat_id in layout.seat_ids if seat_id not in booked]
+    allocator = SeatAllocator(rows_from_layout(layout), free)
+
+    for n, preferences in ((1, None), (2, {"position": "window"}), (4, None), (6, None)):
+        with timer() as t:
+            for _ in range(n_queries):
+                allocator.find(n, preferences)
+        report(f"load {load_factor:.0%}, party of {n} {preferences or ''}", t["elapsed"], n_queries)
+
+    with timer() as t:
+        for _ in range(20):
+            allocator.find(len(free))
+    report(f"load {load_factor:.0%}, whole remaining cabin ({len(free)})", t["elapsed"] / 20)
+
+    with timer() as t:
+        for seat_id in layout.seat_ids:
+            allocator.set_free(seat_id, seat_id not in booked)
+    report(f"load {load_factor:.0%}, set_free updates", t["elapsed"], len(layout))
+
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.seed_seats(layout.seats(), layout.name, layout.key)
+        db.update_bookings(((seat_id, None, None, None, None, "booked") for seat_id in booked),
+                           layout.name)
+        with timer() as t:
+            db.find_best_seats(4, flight_number=layout.name)
+        report(f"load {load_factor:.0%}, DatabaseManager.find_best_seats, first", t["elapsed"])
+        with timer() as t:
+            for _ in range(n_queries):
+                db.find_best_seats(4, flight_number=layout.name)
+        report(f"load {load_factor:.0%}, DatabaseManager.find_best_seats", t["elapsed"], n_queries)
+        free_ids = free[:n_queries // 2]
+        with timer() as t:
+            for seat_id in free_ids:
+                db.book_seat_atomic(seat_id, flight_number=layout.name)
+                db.find_best_seats(4, flight_number=layout.name)
+        report(f"load {load_factor:.0%}, book + find_best_seats", t["elapsed"], len(free_ids))
+        db.close()
+
+
+def main(argv):
+    n_seats = int(argv[1]) if len(argv) > 1 else 500
+    layout = layout_from_dict(cabin_layout_config(n_seats))
+    for load_factor in (0.0, 0.5, 0.8, 0.95):
+        bench_allocator(layout, load_factor)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,47 @@
+"""
+Seat reads through SeatCache versus querying SQLite each time.
+"""
+import random
+import sys
+
+from database_manager import DatabaseManager
+from seat_cache import SeatCache
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def bench_reads(n_seats, n_reads):
+    seats = list(cabin_seats(n_seats))
+    rng = random.Random(757)
+    lookups = [rng.choice(seats)[0] for _ in range(n_reads)]
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.insert_seats(seats)
+        cache = SeatCache(db)
+        cache.get_all_seats()
+
+        for label, source in (("DatabaseManager", db), ("SeatCache", cache)):
+            with timer() as t:
+                for seat_id in lookups:
+                    source.get_seat_status(seat_id)
+            report(f"get_seat_status via {label}", t["elapsed"], n_reads)
+
+        for label, source in (("DatabaseManager", db), ("SeatCache", cache)):
+            with timer() as t:
+                for _ in range(100):
+                    source.get_all_seats()
+            report(f"get_all_seats ({n_seats} seats) via {label}", t["elapsed"], 100)
+
+        with timer() as t:
+            for _ in range(n_reads):
+                cache.sync()
+        report("sync() with no external change", t["elapsed"], n_reads)
+        db.close()
+
+
+def main(argv):
+    n_seats = int(argv[1]) if len(argv) > 1 else 500
+    bench_reads(n_seats, 100_000)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,58 @@
+"""
+Several processes race to book the same seats through book_seat_atomic.
+Every seat must end up booked exactly once.
+"""
+import multiprocessing
+import random
+import sys
+
+from database_manager import OUTCOME_OK, DatabaseManager
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def _agent(path, seat_ids, seed):
+    db = DatabaseManager(path, busy_timeout=30.0)
+    seat_ids = list(seat_ids)
+    random.Random(seed).shuffle(seat_ids)
+    booked = []
+    for seat_id in seat_ids:
+        outcome, _ = db.book_seat_atomic(seat_id, f"P{seed}", "Agent", str(seed))
+        if outcome == OUTCOME_OK:
+            booked.append(seat_id)
+    retries = db.busy_retry_count
+    db.close()
+    return booked, retries
+
+
+def bench_contention(n_seats, n_agents):
+    seats = list(cabin_seats(n_seats))
+    seat_ids = [seat_id for seat_id, _, _ in seats]
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.insert_seats(seats)
+        with timer() as t:
+            with multiprocessing.Pool(n_agents) as pool:
+                results = pool.starmap(_agent, [(path, seat_ids, i) for i in range(n_agents)])
+        attempts = n_seats * n_agents
+        report(f"{n_agents} agents x {n_seats} seats", t["elapsed"], attempts)
+
+        booked = [seat_id for agent_booked, _ in results for seat_id in agent_booked]
+        retries = sum(agent_retries for _, agent_retries in results)
+        bookings = db.cursor.execute("SELECT COUNT(*) FROM bookings;").fetchone()[0]
+        free = len(db.get_free_seats())
+        db.close()
+    double_booked = len(booked) - len(set(booked))
+    print(f"  successful bookings={len(booked)} booking rows={bookings} free={free} "
+          f"double bookings={double_booked} busy retries={retries}")
+    if double_booked or len(booked) != n_seats or bookings != n_seats:
+        raise SystemExit("contention check FAILED")
+
+
+def main(argv):
+    n_seats = int(argv[1]) if len(argv) > 1 else 2000
+    n_agents = int(argv[2]) if len(argv) > 2 else 8
+    bench_contention(n_seats, n_agents)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,91 @@
+"""
+Memory and throughput of the in-memory Flight model for schedule-sized simulations:
+the previous dict of per-seat objects versus the array-backed Flight (one status byte
+per seat, seat ids and index shared between flights of the same aircraft).
+"""
+import os
+import sys
+import tracemalloc
+
+from benchmarks.common import cabin_seats, report, timer
+
+# partA is a script directory (its modules import each other by bare name)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "partA"))
+from flight import Flight  # noqa: E402
+
+
+class _DictSeat:
+    # The pre-slots Seat, kept as the baseline
+    def __init__(self, seat_id, status="free", passenger_name=None):
+        self.seat_id = seat_id
+        self.status = status
+        self.passenger_name = passenger_name
+
+
+class _DictFlight:
+    # The dict-of-seats Flight, kept as the baseline
+    def __init__(self, flight_number, seat_ids):
+        self.flight_number = flight_number
+        self.seats = {seat_id: _DictSeat(seat_id) for seat_id in seat_ids}
+
+    def book_seat(self, seat_id, passenger_name=None):
+        seat = self.seats.get(seat_id)
+        if seat and seat.status == "free":
+            seat.status = "booked"
+            seat.passenger_name = passenger_name
+            return True
+        return False
+
+    def count_free(self):
+        return sum(1 for seat in self.seats.values() if seat.status == "free")
+
+    def get_all_seats_status(self):
+        return {seat_id: seat.status for seat_id, seat in self.seats.items()}
+
+
+def _schedule(kind, n_flights, seat_ids):
+    if kind == "dict":
+        return [_DictFlight(f"SIM{f:06d}", seat_ids) for f in range(n_flights)]
+    first = Flight("SIM000000", seat_ids)
+    return [first] + [first.with_same_seats(f"SIM{f:06d}") for f in range(1, n_flights)]
+
+
+def bench_flight(n_flights, seats_per_flight):
+    seat_ids = [seat_id for seat_id, _, _ in cabin_seats(seats_per_flight)]
+    label = f"{n_flights} flights x {seats_per_flight} seats"
+    for kind in ("dict", "array"):
+        tracemalloc.start()
+        with timer() as t:
+            flights = _schedule(kind, n_flights, seat_ids)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        report(f"{label}: {kind} build ({memory / 2**20:.1f} MiB)", t["elapsed"])
+
+        booked = seat_ids[::3]
+        with timer() as t:
+            if kind == "dict":
+                for flight in flights:
+                    for seat_id in booked:
+                        flight.book_seat(seat_id)
+            else:
+                for flight in flights:
+                    flight.book_seats(booked)
+        report(f"{label}: {kind} book every third seat", t["elapsed"], n_flights * len(booked))
+        with timer() as t:
+            free = sum(flight.count_free() for flight in flights)
+        report(f"{label}: {kind} count_free ({free} free)", t["elapsed"], n_flights)
+        with timer() as t:
+            for flight in flights[:100]:
+                flight.get_all_seats_status()
+        report(f"{label}: {kind} get_all_seats_status x100", t["elapsed"], 100)
+        del flights
+
+
+def main(argv):
+    n_flights = int(argv[1]) if len(argv) > 1 else 5000
+    bench_flight(n_flights, 200)
+    bench_flight(max(1, n_flights // 10), 2000)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,98 @@
+"""
+Reaping expired seat holds with many holds active: a per-seat scan (read every seat,
+free the expired ones one by one) versus release_expired_holds(), a single UPDATE over
+the partial held_until index, and next_hold_expiry() for arming the reaper timer.
+"""
+import sys
+import time
+
+from database_manager import DatabaseManager
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+SEATS_PER_FLIGHT = 500
+
+
+def _hold_all(db, n_flights, expired_fraction, now):
+    # Every seat becomes held; the first expired_fraction of each flight's seats are past
+    # their deadline and the rest expire in an hour
+    cutoff = int(SEATS_PER_FLIGHT * expired_fraction)
+    with db.transaction():
+        for f in range(n_flights):
+            db.cursor.executemany("""
+            UPDATE seats SET status = 'held', held_until = ?, hold_token = 'bench'
+            WHERE flight_number = ? AND seat_id = ?;
+            """, ((now - 1 if i < cutoff else now + 3600, f"HD{f:05d}", seat_id)
+                  for i, (seat_id, _, _) in enumerate(cabin_seats(SEATS_PER_FLIGHT))))
+
+
+def _reap_per_seat(db, now):
+    # The baseline: look at every seat and free expired holds one statement at a time
+    db.cursor.execute("SELECT flight_number, seat_id, status, held_until FROM seats;")
+    expired = [(flight_number, seat_id) for flight_number, seat_id, status, held_until
+               in db.cursor.fetchall() if status == "held" and held_until <= now]
+    with db.transaction():
+        for flight_number, seat_id in expired:
+            db.cursor.execute("""
+            UPDATE seats SET status = 'free', held_until = NULL, hold_token = NULL
+            WHERE flight_number = ? AND seat_id = ?;
+            """, (flight_number, seat_id))
+    return len(expired)
+
+
+def bench_holds(n_holds, free_flights):
+    n_flights = max(1, n_holds // SEATS_PER_FLIGHT)
+    seats = list(cabin_seats(SEATS_PER_FLIGHT))
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with db.transaction():
+            for f in range(n_flights):
+                db.insert_seats(seats, f"HD{f:05d}")
+            # Flights without holds, so the per-seat scan has the rest of the table to wade through
+            for f in range(free_flights):
+                db.insert_seats(seats, f"FR{f:05d}")
+        label = f"{n_flights * SEATS_PER_FLIGHT} holds"
+
+        now = time.time()
+        _hold_all(db, n_flights, 0.0, now)
+        with timer() as t:
+            db.next_hold_expiry()
+        report(f"{label}: next_hold_expiry", t["elapsed"])
+        with timer() as t:
+            db.release_expired_holds(now)
+        report(f"{label}: bulk reap, none expired", t["elapsed"])
+        with timer() as t:
+            _reap_per_seat(db, now)
+        report(f"{label}: per-seat scan, none expired", t["elapsed"])
+
+        for expired_fraction in (0.01, 1.0):
+            _hold_all(db, n_flights, expired_fraction, now)
+            with timer() as t:
+                released = db.release_expired_holds(now)
+            report(f"{label}: bulk reap, {expired_fraction:.0%} expired", t["elapsed"], released)
+
+            _hold_all(db, n_flights, expired_fraction, now)
+            db.add_listener(_ignore)
+            with timer() as t:
+                released = db.release_expired_holds(now)
+            report(f"{label}: bulk reap + events, {expired_fraction:.0%} expired",
+                   t["elapsed"], released)
+            db.remove_listener(_ignore)
+
+            _hold_all(db, n_flights, expired_fraction, now)
+            with timer() as t:
+                released = _reap_per_seat(db, now)
+            report(f"{label}: per-seat scan, {expired_fraction:.0%} expired", t["elapsed"], released)
+        db.close()
+
+
+def _ignore(flight_number, seat_id, status):
+    pass
+
+
+def main(argv):
+    n_holds = int(argv[1]) if len(argv) > 1 else 100_000
+    bench_holds(n_holds, free_flights=n_holds // SEATS_PER_FLIGHT)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,55 @@
+"""
+Streaming export and import throughput for booking_io, in CSV and JSONL.
+"""
+import os
+import sys
+import tracemalloc
+
+from booking_io import export_bookings, import_bookings
+from database_manager import DatabaseManager
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def bench_io(n_flights, seats_per_flight=500):
+    seats = list(cabin_seats(seats_per_flight))
+    n_rows = n_flights * seats_per_flight
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with db.transaction():
+            for f in range(n_flights):
+                flight_number = f"IO{f:05d}"
+                db.insert_seats(seats, flight_number)
+                db.update_bookings(((seat_id, f"{f:04d}{i:04d}", f"P{f}-{i}", "Jane", "Doe", "booked")
+                                    for i, (seat_id, _, _) in enumerate(seats) if i % 3),
+                                   flight_number)
+        directory = os.path.dirname(path)
+        for fmt in ("csv", "jsonl"):
+            out = os.path.join(directory, f"bookings.{fmt}")
+            tracemalloc.start()
+            with timer() as t:
+                with open(out, "w", newline="") as f:
+                    count = export_bookings(db, f, fmt)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            report(f"export {count} rows {fmt} (peak {peak / 2**20:.1f} MiB)", t["elapsed"], count)
+
+            target = DatabaseManager(os.path.join(directory, f"import-{fmt}.db"))
+            tracemalloc.start()
+            with timer() as t:
+                with open(out, newline="") as f:
+                    count = import_bookings(target, f, fmt)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            report(f"import {count} rows {fmt} (peak {peak / 2**20:.1f} MiB)", t["elapsed"], count)
+            target.close()
+        db.close()
+    return n_rows
+
+
+def main(argv):
+    n_flights = int(argv[1]) if len(argv) > 1 else 200
+    bench_io(n_flights)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,48 @@
+"""
+Cost of DatabaseMetrics: the same DatabaseManager calls on a manager that was never
+instrumented, while attached, and after detach().
+"""
+import sys
+
+from database_manager import DatabaseManager
+from db_metrics import DatabaseMetrics
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def _workload(db, seat_ids, flight_number):
+    for seat_id in seat_ids:
+        db.get_seat_status(seat_id, flight_number)
+    for seat_id in seat_ids[::10]:
+        db.book_seat_atomic(seat_id, flight_number=flight_number)
+        db.free_seat_atomic(seat_id, flight_number)
+    db.get_all_seats(flight_number)
+
+
+def bench_metrics(n_seats, rounds):
+    seats = list(cabin_seats(n_seats))
+    seat_ids = [seat_id for seat_id, _, _ in seats]
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.insert_seats(seats, "MX001")
+        metrics = DatabaseMetrics()
+        calls = rounds * (n_seats + n_seats // 10 * 2 + 1)
+        for label in ("plain", "attached", "detached"):
+            if label == "attached":
+                metrics.attach(db)
+            elif label == "detached":
+                metrics.detach(db)
+            _workload(db, seat_ids, "MX001")  # warm up
+            with timer() as t:
+                for _ in range(rounds):
+                    _workload(db, seat_ids, "MX001")
+            report(f"{n_seats} seats x {rounds}: {label}", t["elapsed"], calls)
+        print(metrics.format_line())
+        db.close()
+
+
+def main(argv):
+    bench_metrics(int(argv[1]) if len(argv) > 1 else 2000, rounds=5)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
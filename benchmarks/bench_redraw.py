@@ -0,0 +1,53 @@
+"""
+Seat-map repaint cost versus cabin size: a full update_seat_map() pass compared with
+the event-driven path that repaints only the seats that changed.
+Needs a display (or Xvfb).
+"""
+import os
+import sys
+import tkinter as tk
+
+from booking_systemgui import BookingSystemGUI
+from benchmarks.common import report, temp_db, timer, write_layout
+
+
+def bench_redraw(root, n_seats, n_changes=10, repeats=20):
+    with temp_db() as path:
+        layout_path = write_layout(os.path.join(os.path.dirname(path), "layout.json"), n_seats)
+        gui = BookingSystemGUI(root, path, layout_path)
+        root.update()
+
+        with timer() as t:
+            for _ in range(repeats):
+                gui.update_seat_map()
+                root.update_idletasks()
+        report(f"{len(gui.layout)} seats, full update_seat_map", t["elapsed"] / repeats)
+
+        changed = gui.layout.seat_ids[:n_changes]
+        with timer() as t:
+            for i in range(repeats):
+                status = "booked" if i % 2 == 0 else "free"
+                for seat_id in changed:
+                    gui._on_seat_changed(gui.flight_number, seat_id, status)
+                root.update_idletasks()
+        report(f"{len(gui.layout)} seats, {n_changes} change events", t["elapsed"] / repeats)
+
+        gui.db_manager.close()
+        for child in root.winfo_children():
+            child.destroy()
+
+
+def main(argv):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    root.withdraw()
+    for n_seats in (24, 100, 200, 400, 800):
+        bench_redraw(root, n_seats)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,74 @@
+"""
+Booking reference throughput: the block-reserving allocator versus the old
+random-candidate-plus-SELECT probe loop, and uniqueness across processes.
+"""
+import multiprocessing
+import random
+import string
+import sys
+
+from database_manager import BookingRefAllocator, DatabaseManager
+from benchmarks.common import report, temp_db, timer
+
+
+def _probe_ref(db_manager):
+    # The pre-allocator implementation, kept here as the baseline
+    while True:
+        ref = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
+        if not db_manager.check_booking_ref_exists(ref):
+            return ref
+
+
+def _issue(path, n_refs, block_size):
+    db = DatabaseManager(path)
+    allocator = BookingRefAllocator(db, block_size)
+    refs = [allocator.next_ref() for _ in range(n_refs)]
+    db.close()
+    return refs
+
+
+def bench_single_process(n_refs, block_size):
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        allocator = BookingRefAllocator(db, block_size)
+        with timer() as t:
+            for _ in range(n_refs):
+                allocator.next_ref()
+            db.close()
+    report(f"allocator, block {block_size}, {n_refs} refs", t["elapsed"], n_refs)
+
+
+def bench_probe_loop(n_refs):
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with timer() as t:
+            for _ in range(n_refs):
+                _probe_ref(db)
+        db.close()
+    report(f"random + SELECT probe, {n_refs} refs", t["elapsed"], n_refs)
+
+
+def bench_multi_process(n_procs, n_refs, block_size):
+    with temp_db() as path:
+        DatabaseManager(path).close()
+        with timer() as t:
+            with multiprocessing.Pool(n_procs) as pool:
+                results = pool.starmap(_issue, [(path, n_refs, block_size)] * n_procs)
+    refs = [ref for refs in results for ref in refs]
+    report(f"{n_procs} processes x {n_refs} refs", t["elapsed"], len(refs))
+    duplicates = len(refs) - len(set(refs))
+    print(f"  issued={len(refs)} duplicates={duplicates}")
+    if duplicates:
+        raise SystemExit("uniqueness check FAILED")
+
+
+def main(argv):
+    n_refs = int(argv[1]) if len(argv) > 1 else 1_000_000
+    bench_probe_loop(min(n_refs, 50_000))
+    for block_size in (100, 1000, 10_000):
+        bench_single_process(n_refs, block_size)
+    bench_multi_process(4, n_refs // 4, 1000)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
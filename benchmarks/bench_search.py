@@ -0,0 +1,80 @@
+"""
+Passenger lookups on a large bookings table: an unindexed LIKE scan (the only option
+before) versus find_bookings_by_name() and search_passengers() over the normalized name
+indexes and the FTS5 index. The target is well under 10 ms per query at a million bookings.
+"""
+import random
+import sys
+
+from database_manager import DatabaseManager, split_passenger_name
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+SEATS_PER_FLIGHT = 500
+SYLLABLES = ["an", "be", "ca", "da", "el", "fi", "go", "ha", "jo", "ka", "li", "ma", "no",
+             "pe", "ri", "sa", "to", "vi", "wa", "yu", "zo", "mi", "ro", "su"]
+
+
+def _names(rng, count, syllables):
+    # Pronounceable synthetic names, so prefixes and typos behave like real ones
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(syllables)).capitalize())
+    return sorted(names)
+
+
+def bench_search(n_bookings):
+    rng = random.Random(17)
+    first_names = _names(rng, 2000, 3)
+    last_names = _names(rng, 20000, 4)
+    seats = list(cabin_seats(SEATS_PER_FLIGHT))
+    n_flights = max(1, n_bookings // SEATS_PER_FLIGHT)
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with timer() as t:
+            for f in range(n_flights):
+                flight_number = f"SR{f:05d}"
+                with db.transaction():
+                    db.insert_seats(seats, flight_number)
+                    db.update_bookings(
+                        ((seat_id, f"R{f:04d}{i:03d}", f"P{rng.randrange(10**8):08d}",
+                          *split_passenger_name(f"{rng.choice(first_names)} {rng.choice(last_names)}"),
+                          "booked") for i, (seat_id, _, _) in enumerate(seats)),
+                        flight_number)
+        n_bookings = n_flights * SEATS_PER_FLIGHT
+        report(f"{n_bookings} bookings: load", t["elapsed"], n_bookings)
+
+        booking_ref, _, _, passport_num, first_name, last_name = db.search_passengers(
+            last_names[len(last_names) // 2])[0]
+        typo = last_name[:2] + last_name[3] + last_name[2] + last_name[4:]
+        label = f"{n_bookings} bookings"
+
+        with timer() as t:
+            rows = db.conn.execute("SELECT * FROM bookings WHERE last_name LIKE ?;",
+                                   (f"%{last_name[1:]}%",)).fetchall()
+        report(f"{label}: LIKE scan ({len(rows)} rows)", t["elapsed"])
+        queries = [
+            ("find_bookings_by_name", lambda: db.find_bookings_by_name(last_name, first_name)),
+            ("search full name", lambda: db.search_passengers(f"{first_name} {last_name}")),
+            ("search last name", lambda: db.search_passengers(last_name)),
+            ("search 2-letter prefix", lambda: db.search_passengers(last_name[:2])),
+            ("search two prefixes", lambda: db.search_passengers(f"{first_name[:3]} {last_name[:4]}")),
+            ("search passport prefix", lambda: db.search_passengers(passport_num[:6])),
+            ("search booking ref", lambda: db.search_passengers(booking_ref)),
+            ("search misspelt last name", lambda: db.search_passengers(typo)),
+            ("search no match", lambda: db.search_passengers("qqqq")),
+        ]
+        for name, query in queries:
+            query()  # warm the page cache
+            with timer() as t:
+                for _ in range(20):
+                    rows = query()
+            report(f"{label}: {name} ({len(rows)} rows)", t["elapsed"] / 20)
+        db.close()
+
+
+def main(argv):
+    bench_search(int(argv[1]) if len(argv) > 1 else 1_000_000)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,38 @@
+"""
+Seat-map startup time versus cabin size: one tk.Button per seat (build_seat_map)
+compared with the viewport-rendered canvas (build_seat_canvas).
+Needs a display (or Xvfb).
+"""
+import os
+import sys
+import tkinter as tk
+
+from booking_systemgui import BookingSystemGUI
+from benchmarks.common import report, temp_db, timer, write_layout
+
+
+def bench_startup(n_seats, renderer):
+    with temp_db() as path:
+        layout_path = write_layout(os.path.join(os.path.dirname(path), "layout.json"), n_seats)
+        root = tk.Tk()
+        with timer() as t:
+            gui = BookingSystemGUI(root, path, layout_path, renderer=renderer)
+            root.update()
+        report(f"{len(gui.layout)} seats, {renderer}", t["elapsed"])
+        gui.db_manager.close()
+        root.destroy()
+
+
+def main(argv):
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    for n_seats in (24, 200, 500, 1000, 2000):
+        for renderer in ("buttons", "canvas"):
+            bench_startup(n_seats, renderer)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,90 @@
+"""
+Cold-launch time of the booking GUI against a fixed budget, for a range of cabin sizes.
+Every launch runs in a fresh interpreter and is timed in phases: importing the modules,
+building the window, and loading seat state (opening the database, seeding the layout
+on first launch, painting the seat map). Each cabin is launched twice: first launch on a
+new database file, then a relaunch that should skip seeding.
+
+Without a display the window phase is skipped and the database work of _load_seats is
+timed on its own. Exits with status 1 if any launch exceeds STARTUP_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import report, temp_db, write_layout
+
+# Launch to painted seat map, whatever the aircraft size (milliseconds)
+STARTUP_BUDGET_MS = 1000
+
+CABIN_SIZES = (24, 500, 2000, 10000)
+
+
+def _child(db_name, layout_path):
+    # Runs in the fresh interpreter; prints the phase timings as JSON
+    start = time.perf_counter()
+    import tkinter as tk
+    from booking_systemgui import BookingSystemGUI
+    imported = time.perf_counter()
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        root = None
+    if root is not None:
+        gui = BookingSystemGUI(root, db_name, layout_path)
+        window = time.perf_counter()
+        root.update()
+        loaded = time.perf_counter()
+        gui.on_exit()
+        root.destroy()
+    else:
+        from aircraft_layout import load_layout
+        from database_manager import DatabaseManager
+        from seat_cache import SeatCache
+        layout = load_layout(layout_path)
+        window = time.perf_counter()
+        seat_cache = SeatCache(DatabaseManager(db_name))
+        seat_cache.seed_seats(layout.seats(), layout.name, layout.key)
+        seat_cache.get_all_seats(layout.name)
+        loaded = time.perf_counter()
+        seat_cache.close()
+    print(json.dumps({"display": root is not None, "import": imported - start,
+                      "window": window - imported, "loaded": loaded - window,
+                      "total": loaded - start}))
+
+
+def launch(db_name, layout_path):
+    """Time one launch in a fresh interpreter; returns the phase timings in seconds."""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", db_name, layout_path],
+        cwd=repo, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main(argv):
+    if len(argv) == 4 and argv[1] == "--child":
+        _child(argv[2], argv[3])
+        return 0
+    over_budget = False
+    for n_seats in CABIN_SIZES:
+        with temp_db() as path:
+            layout_path = write_layout(os.path.join(os.path.dirname(path), "layout.json"), n_seats)
+            for label in ("first launch", "relaunch"):
+                timings = launch(path, layout_path)
+                prefix = f"{n_seats} seats, {label}"
+                report(f"{prefix}: import", timings["import"])
+                if timings["display"]:
+                    report(f"{prefix}: window", timings["window"])
+                report(f"{prefix}: load seats", timings["loaded"])
+                report(f"{prefix}: total", timings["total"])
+                if timings["total"] * 1000 > STARTUP_BUDGET_MS:
+                    print(f"  over budget: {timings['total'] * 1000:.0f} ms > {STARTUP_BUDGET_MS} ms")
+                    over_budget = True
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,61 @@
+"""
+Booking status reporting on a many-flight database: the old string-building report
+versus SQL aggregates and keyset-paginated pages.
+"""
+import sys
+
+from database_manager import DatabaseManager
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def _old_status_text(db, flight_number):
+    # The pre-StatusView report, kept as the baseline
+    status_text = "Current Seat Status:\n\n"
+    for seat_id, status in db.get_all_seats(flight_number):
+        status_text += f"{seat_id}: {status}\n"
+    return status_text
+
+
+def bench_status(n_flights, seats_per_flight):
+    seats = list(cabin_seats(seats_per_flight))
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with db.transaction():
+            for f in range(n_flights):
+                flight_number = f"ST{f:05d}"
+                db.insert_seats(seats, flight_number)
+                db.update_bookings(((seat_id, None, None, None, None, "booked")
+                                    for seat_id, _, _ in seats[::2]), flight_number)
+        flight_number = f"ST{n_flights // 2:05d}"
+        label = f"{n_flights} flights x {seats_per_flight} seats"
+
+        with timer() as t:
+            _old_status_text(db, flight_number)
+        report(f"{label}: old status string", t["elapsed"])
+        with timer() as t:
+            db.count_by_status(flight_number)
+            db.count_by_row(flight_number)
+        report(f"{label}: count_by_status + count_by_row", t["elapsed"])
+        with timer() as t:
+            db.page_seats(flight_number)
+        report(f"{label}: first seat page", t["elapsed"])
+        with timer() as t:
+            rows = sum(len(page) for page in db.iter_seat_pages(flight_number))
+        report(f"{label}: all seat pages ({rows} rows)", t["elapsed"])
+        with timer() as t:
+            db.page_occupancy()
+        report(f"{label}: first occupancy page", t["elapsed"])
+        with timer() as t:
+            db.page_occupancy(f"ST{n_flights - 150:05d}")
+        report(f"{label}: occupancy page near the end", t["elapsed"])
+        db.close()
+
+
+def main(argv):
+    n_flights = int(argv[1]) if len(argv) > 1 else 2000
+    for seats_per_flight in (24, 500, 2000):
+        bench_status(max(1, n_flights * 24 // seats_per_flight), seats_per_flight)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,121 @@
+"""
+Seeding and rebooking cost: per-row commits versus the batched write API,
+plus indexed lookups on a multi-flight database and seeding from an aircraft layout.
+"""
+import random
+import sys
+
+from aircraft_layout import LAYOUT_DIR, load_layout
+from database_manager import DatabaseManager
+from benchmarks.common import cabin_seats, report, temp_db, timer
+
+
+def bench_seed(n_seats):
+    seats = list(cabin_seats(n_seats))
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with timer() as t:
+            for seat in seats:
+                db.insert_seat(*seat)
+        db.close()
+    report(f"seed {n_seats} seats, insert_seat per row", t["elapsed"], n_seats)
+
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with timer() as t:
+            db.insert_seats(seats)
+        db.close()
+    report(f"seed {n_seats} seats, insert_seats", t["elapsed"], n_seats)
+
+
+def bench_rebook(n_seats):
+    seats = list(cabin_seats(n_seats))
+    bookings = [(seat_id, f"R{i:07d}", f"P{i:07d}", "Jane", "Doe", "booked")
+                for i, (seat_id, _, _) in enumerate(seats)]
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.insert_seats(seats)
+        with timer() as t:
+            for booking in bookings:
+                db.update_seat_booking(*booking)
+        report(f"rebook {n_seats} seats, update_seat_booking", t["elapsed"], n_seats)
+
+        with timer() as t:
+            db.update_bookings((seat_id, None, None, None, None, "free") for seat_id, _, _ in seats)
+        report(f"rebook {n_seats} seats, update_bookings", t["elapsed"], n_seats)
+
+        with timer() as t:
+            with db.transaction():
+                for booking in bookings:
+                    db.update_seat_booking(*booking)
+        report(f"rebook {n_seats} seats, transaction() scope", t["elapsed"], n_seats)
+        db.close()
+
+
+def bench_lookups(n_flights, seats_per_flight=300, n_queries=1000):
+    seats = list(cabin_seats(seats_per_flight))
+    rng = random.Random(757)
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with db.transaction():
+            for f in range(n_flights):
+                flight_number = f"AA{f:05d}"
+                db.insert_seats(seats, flight_number)
+                db.update_bookings(
+                    ((seat_id, f"{flight_number}{seat_id}", f"P{flight_number}-{seat_id}", "Jane", "Doe", "booked")
+                     for seat_id, _, _ in rng.sample(seats, seats_per_flight // 2)),
+                    flight_number)
+        flights = [f"AA{rng.randrange(n_flights):05d}" for _ in range(n_queries)]
+        with timer() as t:
+            for flight_number in flights:
+                db.get_free_seats(flight_number)
+        report(f"free seats on 1 of {n_flights} flights", t["elapsed"], n_queries)
+
+        with timer() as t:
+            for flight_number in flights:
+                db.get_seat_status("12C", flight_number)
+        report("get_seat_status", t["elapsed"], n_queries)
+
+        with timer() as t:
+            for flight_number in flights:
+                db.check_booking_ref_exists(f"{flight_number}12C")
+        report("check_booking_ref_exists", t["elapsed"], n_queries)
+
+        with timer() as t:
+            for flight_number in flights:
+                db.find_bookings_by_passport(f"P{flight_number}-12C")
+        report("find_bookings_by_passport", t["elapsed"], n_queries)
+        db.close()
+
+
+def bench_layout_seed(n_repeats=100):
+    with timer() as t:
+        for _ in range(n_repeats):
+            layout = load_layout(f"{LAYOUT_DIR}/widebody.json")
+    report(f"load widebody layout ({len(layout)} seats)", t["elapsed"] / n_repeats)
+
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        with timer() as t:
+            for f in range(n_repeats):
+                db.insert_seats(layout.seats(), f"WB{f:03d}")
+        report(f"seed {n_repeats} widebody flights", t["elapsed"], n_repeats * len(layout))
+        db.close()
+
+    with timer() as t:
+        for seat_id in layout.seat_ids * n_repeats:
+            layout.position(seat_id)
+    report("layout.position lookups", t["elapsed"], n_repeats * len(layout))
+
+
+def main(argv):
+    n_seats = int(argv[1]) if len(argv) > 1 else 10000
+    n_flights = int(argv[2]) if len(argv) > 2 else 2000
+    bench_seed(n_seats)
+    bench_rebook(n_seats)
+    bench_lookups(n_flights)
+    bench_layout_seed()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,63 @@
+"""
+Shared helpers for the benchmark scripts.
+Run any benchmark from the repository root, e.g. `python -m benchmarks.bench_storage`;
+`python -m benchmarks.suite` runs the headless suite and can write and compare JSON results.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def temp_db(name="bench.db"):
+    """Yield the path of a fresh SQLite file inside a throwaway directory."""
+    directory = tempfile.mkdtemp(prefix="burak757-bench-")
+    try:
+        yield os.path.join(directory, name)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextmanager
+def timer():
+    """Measure the wall-clock time of a block; read `elapsed` after it exits."""
+    result = {"elapsed": 0.0}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["elapsed"] = time.perf_counter() - start
+
+
+def cabin_seats(n_seats, seats_per_row=10):
+    """Generate (seat_id, seat_row, seat_col) tuples for a cabin of n_seats."""
+    letters = "ABCDEFGHJK"[:seats_per_row]
+    for i in range(n_seats):
+        row, col = divmod(i, seats_per_row)
+        yield f"{row + 1}{letters[col]}", row + 1, letters[col]
+
+
+def cabin_layout_config(n_seats):
+    """Aircraft config (see aircraft_layout) for a 3-4-3 cabin of about n_seats seats."""
+    n_rows = max(1, -(-n_seats // 10))
+    return {
+        "name": f"Bench{n_seats}",
+        "cabins": [{"name": "Economy", "rows": [1, n_rows],
+                    "seats": ["A", "B", "C", "|", "D", "E", "F", "G", "|", "H", "J", "K"]}],
+    }
+
+
+def write_layout(path, n_seats):
+    with open(path, "w") as f:
+        json.dump(cabin_layout_config(n_seats), f)
+    return path
+
+
+def report(label, elapsed, count=None):
+    line = f"{label:<45} {elapsed * 1000:10.2f} ms"
+    if count:
+        line += f"  {count / elapsed if elapsed else float('inf'):12,.0f} ops/s"
+    print(line)
@@ -0,0 +1,270 @@
+"""
+Display-free stand-in for the parts of tkinter the booking GUI uses, so the GUI can be
+benchmarked headless (CI, SSH, containers) without Xvfb.
+
+    from benchmarks import fake_tk
+    fake_tk.install()               # before booking_systemgui is imported
+    from booking_systemgui import BookingSystemGUI
+
+Widgets keep their options in a dict and canvases number their items, which is the
+Python-side work update_seat_map() drives; nothing is drawn. update() and
+update_idletasks() run the after_idle() callbacks; after() timers are recorded but
+only run by run_timers(), so polling loops never fire on their own.
+"""
+import sys
+import types
+
+CONSTANTS = {
+    "END": "end", "LEFT": "left", "RIGHT": "right", "TOP": "top", "BOTTOM": "bottom",
+    "BOTH": "both", "X": "x", "Y": "y", "N": "n", "S": "s", "E": "e", "W": "w", "NW": "nw",
+    "SUNKEN": "sunken", "RAISED": "raised", "VERTICAL": "vertical", "HORIZONTAL": "horizontal",
+    "NORMAL": "normal", "DISABLED": "disabled", "ALL": "all",
+}
+
+
+class TclError(Exception):
+    pass
+
+
+class Misc:
+    """Base of every fake widget; after() queues are shared, like one Tk interpreter."""
+    _idle = []
+    _timers = []
+
+    def __init__(self, master=None, cnf=None, **options):
+        self.master = master
+        self.options = dict(cnf or {}, **options)
+        self.children = []
+        self.destroyed = False
+        if master is not None:
+            master.children.append(self)
+
+    def config(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key)
+
+    __getitem__ = cget
+
+    def pack(self, **options):
+        pass
+
+    grid = place = pack
+
+    def bind(self, sequence=None, func=None, add=None):
+        pass
+
+    def focus_set(self):
+        pass
+
+    def title(self, text=None):
+        pass
+
+    def protocol(self, name=None, func=None):
+        pass
+
+    def withdraw(self):
+        pass
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def winfo_exists(self):
+        widget = self
+        while widget is not None:
+            if widget.destroyed:
+                return False
+            widget = widget.master
+        return True
+
+    def winfo_width(self):
+        return self.options.get("width", 400)
+
+    def winfo_height(self):
+        return self.options.get("height", 400)
+
+    def after(self, ms, func=None, *args):
+        Misc._timers.append((func, args))
+        return f"after#{len(Misc._timers)}"
+
+    def after_idle(self, func, *args):
+        Misc._idle.append((func, args))
+        return f"idle#{len(Misc._idle)}"
+
+    def after_cancel(self, after_id):
+        pass
+
+    def update_idletasks(self):
+        while Misc._idle:
+            func, args = Misc._idle.pop(0)
+            func(*args)
+
+    update = update_idletasks
+
+    def mainloop(self, n=0):
+        pass
+
+    def quit(self):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+        if self.master is not None and self in self.master.children:
+            self.master.children.remove(self)
+
+
+def run_timers():
+    """Run (and forget) every after() callback scheduled so far."""
+    timers, Misc._timers = Misc._timers, []
+    for func, args in timers:
+        func(*args)
+
+
+def reset():
+    """Drop all pending after() and after_idle() callbacks."""
+    Misc._idle.clear()
+    Misc._timers.clear()
+
+
+class Tk(Misc):
+    pass
+
+
+class Toplevel(Misc):
+    pass
+
+
+class Frame(Misc):
+    pass
+
+
+class Label(Misc):
+    pass
+
+
+class Button(Misc):
+    pass
+
+
+class Scrollbar(Misc):
+    def set(self, first, last):
+        pass
+
+
+class Entry(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.text = ""
+
+    def get(self):
+        return self.text
+
+    def insert(self, index, text):
+        self.text = text if index == 0 else self.text + text
+
+    def delete(self, first, last=None):
+        self.text = ""
+
+
+class Canvas(Misc):
+    def __init__(self, master=None, cnf=None, **options):
+        super().__init__(master, cnf, **options)
+        self.items = {}
+        self._next_item = 0
+
+    def _create(self, coords, options):
+        self._next_item += 1
+        self.items[self._next_item] = options
+        return self._next_item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create(coords, options)
+
+    create_text = create_line = create_oval = create_rectangle
+
+    def itemconfig(self, item, cnf=None, **options):
+        self.items[item].update(cnf or {}, **options)
+
+    itemconfigure = itemconfig
+
+    def delete(self, *items):
+        for item in items:
+            if item == "all":
+                self.items.clear()
+            else:
+                self.items.pop(item, None)
+
+    def coords(self, item, *coords):
+        pass
+
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return y
+
+    def yview(self, *args):
+        return 0.0, 1.0
+
+    def yview_scroll(self, number, what):
+        pass
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+class Treeview(Misc):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.rows = {}
+
+    def heading(self, column, **options):
+        pass
+
+    def column(self, column, **options):
+        pass
+
+    def insert(self, parent, index, values=(), **options):
+        item_id = f"I{len(self.rows) + 1:03d}"
+        self.rows[item_id] = values
+        return item_id
+
+    def get_children(self, item=None):
+        return tuple(self.rows)
+
+    def delete(self, *items):
+        for item in items:
+            self.rows.pop(item, None)
+
+    def item(self, item, option=None):
+        return self.rows[item] if option == "values" else {"values": self.rows[item]}
+
+    def selection(self):
+        return ()
+
+    def yview(self, *args):
+        return 0.0, 1.0
+
+
+def _message(*args, **kwargs):
+    return "ok"
+
+
+def install():
+    """Register the fake as tkinter, tkinter.ttk and tkinter.messagebox in sys.modules."""
+    tkinter = types.ModuleType("tkinter")
+    tkinter.__dict__.update(CONSTANTS)
+    for cls in (TclError, Misc, Tk, Toplevel, Frame, Label, Button, Scrollbar, Entry, Canvas):
+        setattr(tkinter, cls.__name__, cls)
+    ttk = types.ModuleType("tkinter.ttk")
+    ttk.Treeview = Treeview
+    ttk.Frame, ttk.Label, ttk.Button, ttk.Entry, ttk.Scrollbar = Frame, Label, Button, Entry, Scrollbar
+    messagebox = types.ModuleType("tkinter.messagebox")
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(messagebox, name, _message)
+    messagebox.askyesno = lambda *args, **kwargs: True
+    tkinter.ttk, tkinter.messagebox = ttk, messagebox
+    sys.modules.update({"tkinter": tkinter, "tkinter.ttk": ttk, "tkinter.messagebox": messagebox})
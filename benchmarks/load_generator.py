@@ -0,0 +1,156 @@
+"""
+Load generator for booking_service: keep-alive HTTP clients issuing a mix of
+check / status / book / free requests, reporting requests/sec and latency percentiles.
+
+    python -m benchmarks.load_generator                       # in-process service on a temp DB
+    python -m benchmarks.load_generator --port 8757 --flight Burak757   # against a running service
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+from benchmarks.common import cabin_seats, temp_db
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+async def run_load(host, port, flight_number, seat_ids, n_requests, concurrency, seed=757):
+    """Returns {operation: [latency_seconds, ...]} and the total elapsed time."""
+    latencies = {"check": [], "status": [], "book": [], "free": []}
+    errors = 0
+    remaining = [n_requests]
+    rng = random.Random(seed)
+
+    async def worker():
+        nonlocal errors
+        client = Client(host, port)
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                seat_id = rng.choice(seat_ids)
+                roll = rng.random()
+                if roll < 0.55:
+                    op, method, path, payload = "check", "GET", f"/flights/{flight_number}/seats/{seat_id}", None
+                elif roll < 0.60:
+                    op, method, path, payload = "status", "GET", f"/flights/{flight_number}/seats", None
+                elif roll < 0.85:
+                    op, method, path = "book", "POST", f"/flights/{flight_number}/seats/{seat_id}/book"
+                    payload = {"passport_num": f"P{rng.randrange(10**8)}", "first_name": "Load",
+                               "last_name": "Test"}
+                else:
+                    op, method, path, payload = "free", "POST", f"/flights/{flight_number}/seats/{seat_id}/free", None
+                start = time.perf_counter()
+                status = await client.request(method, path, payload)
+                latencies[op].append(time.perf_counter() - start)
+                # 404/409 are expected outcomes (unknown seat, already booked/free)
+                if status >= 500:
+                    errors += 1
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start, errors
+
+
+def print_report(latencies, elapsed, errors):
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} requests in {elapsed:.2f} s: {total / elapsed:,.0f} req/s, {errors} server errors")
+    every = sorted(v for values in latencies.values() for v in values)
+    for op, values in list(latencies.items()) + [("all", every)]:
+        values = sorted(values)
+        if values:
+            print(f"  {op:<7} n={len(values):<7} p50={percentile(values, 50) * 1000:7.2f} ms  "
+                  f"p99={percentile(values, 99) * 1000:7.2f} ms  max={values[-1] * 1000:7.2f} ms")
+
+
+def _start_local_service(path, seats, flight_number, port_box, ready, stop):
+    from booking_service import BookingService
+
+    async def serve():
+        service = BookingService(path)
+        service.seed(seats, flight_number)
+        server = await service.start("127.0.0.1", 0)
+        port_box.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+    asyncio.run(serve())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test booking_service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port of a running service (default: start one)")
+    parser.add_argument("--flight", default="LOAD001")
+    parser.add_argument("--seats", type=int, default=500, help="seats to seed / target")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    seats = list(cabin_seats(args.seats))
+    seat_ids = [seat_id for seat_id, _, _ in seats]
+    if args.port:
+        print_report(*asyncio.run(run_load(args.host, args.port, args.flight, seat_ids,
+                                           args.requests, args.concurrency)))
+        return
+    with temp_db() as path:
+        # The service runs its own event loop on a thread so client and server timings
+        # do not share one loop
+        port_box, ready, stop = [], threading.Event(), threading.Event()
+        thread = threading.Thread(target=_start_local_service,
+                                  args=(path, seats, args.flight, port_box, ready, stop))
+        thread.start()
+        ready.wait()
+        try:
+            print_report(*asyncio.run(run_load("127.0.0.1", port_box[0], args.flight, seat_ids,
+                                               args.requests, args.concurrency)))
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Reproducible benchmark suite with machine-readable results, for comparing versions.
+
+    python -m benchmarks.suite --json before.json              # on the old revision
+    python -m benchmarks.suite --json after.json --compare before.json
+
+Runs headless: every case uses a fresh temporary SQLite file, and the seat-map cases
+drive BookingSystemGUI through benchmarks.fake_tk, so they time the Python side of
+update_seat_map() (seat reads, per-seat color lookups, widget/canvas item updates) but
+no drawing; bench_redraw measures real Tk on a display. Inputs are fixed (cabin layouts,
+seeded random orders); each case runs --repeats times and reports the median and min.
+
+With --compare, cases whose median and min are both more than --threshold slower than
+the baseline's are flagged and the exit status is 1 (requiring both keeps one noisy
+repeat from failing a run).
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from aircraft_layout import layout_from_dict
+from database_manager import OUTCOME_OK, DatabaseManager, generate_unique_booking_ref
+from benchmarks.common import cabin_layout_config, report, temp_db, timer, write_layout
+
+# partA is a script directory (its modules import each other by bare name)
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO, "partA"))
+from flight import Flight  # noqa: E402
+
+CABIN_SIZES = (24, 500, 2000)
+CASES = ("seed", "book", "contention", "refs", "flight", "seatmap")
+RESULTS_FORMAT = 1
+
+
+class Suite:
+    """Runs cases and collects one result dict per measurement."""
+    def __init__(self, repeats):
+        self.repeats = repeats
+        self.results = []
+
+    def measure(self, name, params, run, ops=None):
+        """
+        Time run(timer) --repeats times; run opens the timer around just the measured
+        part, so per-repeat setup (a fresh database, a new GUI) is not counted.
+        """
+        times = []
+        for _ in range(self.repeats):
+            gc.collect()
+            elapsed = [0.0]
+
+            @contextmanager
+            def timed():
+                with timer() as t:
+                    yield
+                elapsed[0] += t["elapsed"]
+            run(timed)
+            times.append(elapsed[0])
+        self.add(name, params, times, ops)
+
+    def add(self, name, params, times, ops=None):
+        median = statistics.median(times)
+        result = {
+            "id": result_id(name, params),
+            "name": name,
+            "params": params,
+            "repeats": len(times),
+            "median_s": median,
+            "min_s": min(times),
+            "max_s": max(times),
+        }
+        if ops:
+            result["ops"] = ops
+            result["ops_per_s"] = ops / median if median else None
+        self.results.append(result)
+        report(result["id"], median, ops)
+
+
+def result_id(name, params):
+    return name + "".join(f" {key}={value}" for key, value in sorted(params.items()))
+
+
+def bench_layout(n_seats):
+    return layout_from_dict(cabin_layout_config(n_seats))
+
+
+def _booking_order(seat_ids):
+    seat_ids = list(seat_ids)
+    random.Random(757).shuffle(seat_ids)
+    return seat_ids
+
+
+# --- DatabaseManager ---------------------------------------------------------------
+
+def case_seed(suite, n_seats):
+    layout = bench_layout(n_seats)
+    params = {"seats": len(layout)}
+
+    def first_launch(timed):
+        with temp_db() as path:
+            db = DatabaseManager(path)
+            db.conn  # connect and create the schema outside the timed part
+            with timed():
+                db.seed_seats(layout.seats(), layout.name, layout.key)
+            db.close()
+    suite.measure("seed_seats", params, first_launch, len(layout))
+
+    with temp_db() as path:
+        db = DatabaseManager(path)
+        db.seed_seats(layout.seats(), layout.name, layout.key)
+
+        def relaunch(timed):
+            with timed():
+                db.seed_seats(layout.seats(), layout.name, layout.key)
+        suite.measure("seed_seats relaunch", params, relaunch)
+        db.close()
+
+
+def case_book(suite, n_seats):
+    layout = bench_layout(n_seats)
+    params = {"seats": len(layout)}
+    order = _booking_order(layout.seat_ids)
+
+    def seeded(path):
+        db = DatabaseManager(path)
+        db.seed_seats(layout.seats(), layout.name, layout.key)
+        return db
+
+    def single(timed):
+        with temp_db() as path:
+            db = seeded(path)
+            with timed():
+                for i, seat_id in enumerate(order):
+                    db.book_seat_atomic(seat_id, f"P{i:08d}", "Bench", f"Passenger{i}",
+                                        layout.name)
+            db.close()
+    suite.measure("book_seat_atomic", params, single, len(order))
+
+    def free(timed):
+        with temp_db() as path:
+            db = seeded(path)
+            for i, seat_id in enumerate(order):
+                db.book_seat_atomic(seat_id, f"P{i:08d}", "Bench", f"Passenger{i}", layout.name)
+            with timed():
+                for seat_id in order:
+                    db.free_seat_atomic(seat_id, layout.name)
+            db.close()
+    suite.measure("free_seat_atomic", params, free, len(order))
+
+    bookings = [(seat_id, f"B{i:07d}", f"P{i:08d}", "Bench", f"Passenger{i}", "booked")
+                for i, seat_id in enumerate(order)]
+
+    def bulk(timed):
+        with temp_db() as path:
+            db = seeded(path)
+            with timed():
+                db.update_bookings(bookings, layout.name)
+            db.close()
+    suite.measure("update_bookings", params, bulk, len(bookings))
+
+
+def _agent(path, flight_number, seat_ids, seed):
+    db = DatabaseManager(path, busy_timeout=30.0)
+    seat_ids = list(seat_ids)
+    random.Random(seed).shuffle(seat_ids)
+    booked = [seat_id for seat_id in seat_ids
+              if db.book_seat_atomic(seat_id, f"P{seed}", "Agent", str(seed),
+                                     flight_number)[0] == OUTCOME_OK]
+    db.close()
+    return booked
+
+
+def case_contention(suite, n_seats, n_agents):
+    layout = bench_layout(n_seats)
+    params = {"seats": len(layout), "agents": n_agents}
+
+    def race(timed):
+        with temp_db() as path:
+            db = DatabaseManager(path)
+            db.seed_seats(layout.seats(), layout.name, layout.key)
+            with multiprocessing.Pool(n_agents) as pool:
+                args = [(path, layout.name, layout.seat_ids, seed) for seed in range(n_agents)]
+                with timed():
+                    results = pool.starmap(_agent, args)
+            booked = [seat_id for agent_booked in results for seat_id in agent_booked]
+            db.close()
+        if len(booked) != len(layout) or len(set(booked)) != len(booked):
+            raise SystemExit(f"contention check FAILED: {len(booked)} bookings for "
+                             f"{len(layout)} seats, {len(booked) - len(set(booked))} doubled")
+    suite.measure("contention", params, race, len(layout) * n_agents)
+
+
+def case_refs(suite, n_refs):
+    def issue(timed):
+        with temp_db() as path:
+            db = DatabaseManager(path)
+            with timed():
+                refs = {generate_unique_booking_ref(db) for _ in range(n_refs)}
+            db.close()
+        if len(refs) != n_refs:
+            raise SystemExit(f"ref uniqueness check FAILED: {n_refs - len(refs)} duplicates")
+    suite.measure("generate_unique_booking_ref", {"refs": n_refs}, issue, n_refs)
+
+
+# --- partA.flight.Flight -----------------------------------------------------------
+
+def case_flight(suite, n_seats):
+    seat_ids = bench_layout(n_seats).seat_ids
+    params = {"seats": len(seat_ids)}
+    order = _booking_order(seat_ids)
+
+    def single(timed):
+        flight = Flight("SIM001", seat_ids)
+        with timed():
+            for seat_id in order:
+                flight.book_seat(seat_id, "Bench Passenger")
+    suite.measure("Flight.book_seat", params, single, len(order))
+
+    def bulk(timed):
+        flight = Flight("SIM001", seat_ids)
+        with timed():
+            flight.book_seats(order, "Bench Passenger")
+            flight.free_seats(order)
+    suite.measure("Flight.book_seats+free_seats", params, bulk, 2 * len(order))
+
+    flight = Flight("SIM001", seat_ids)
+    flight.book_seats(order[::3])
+
+    def status(timed):
+        with timed():
+            flight.count_free()
+            flight.get_all_seats_status()
+    suite.measure("Flight.count_free+get_all_seats_status", params, status)
+
+
+# --- BookingSystemGUI --------------------------------------------------------------
+
+def case_seatmap(suite, n_seats, n_changes=10):
+    from benchmarks import fake_tk
+    fake_tk.install()
+    import tkinter as tk
+    from booking_systemgui import BookingSystemGUI
+
+    for renderer in ("buttons", "canvas"):
+        with temp_db() as path:
+            layout_path = write_layout(os.path.join(os.path.dirname(path), "layout.json"), n_seats)
+            params = {"seats": len(bench_layout(n_seats)), "renderer": renderer}
+
+            def startup(timed):
+                # Window plus the idle-time seat load, on a new database each time
+                with temp_db() as db_path:
+                    root = tk.Tk()
+                    with timed():
+                        gui = BookingSystemGUI(root, db_path, layout_path, renderer=renderer)
+                        root.update()
+                    gui.on_exit()
+                    fake_tk.reset()
+            suite.measure("gui startup", params, startup)
+
+            root = tk.Tk()
+            gui = BookingSystemGUI(root, path, layout_path, renderer=renderer)
+            root.update()
+
+            def refresh(timed):
+                with timed():
+                    gui.update_seat_map()
+                    root.update_idletasks()
+            suite.measure("update_seat_map", params, refresh, len(gui.layout))
+
+            changed = gui.layout.seat_ids[:n_changes]
+            statuses = {"next": "booked"}
+
+            def events(timed):
+                status = statuses["next"]
+                statuses["next"] = "free" if status == "booked" else "booked"
+                with timed():
+                    for seat_id in changed:
+                        gui._on_seat_changed(gui.flight_number, seat_id, status)
+                    root.update_idletasks()
+            suite.measure(f"{n_changes} seat-change events", params, events, n_changes)
+
+            gui.on_exit()
+            fake_tk.reset()
+
+
+# --- Results -----------------------------------------------------------------------
+
+def environment():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=REPO, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        revision, dirty = None, None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_revision": revision,
+        "git_dirty": dirty,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print median changes against a baseline results file; returns the regressed ids."""
+    before = {result["id"]: result for result in baseline["results"]}
+    print(f"\ncompared with {baseline['environment'].get('git_revision') or 'baseline'} "
+          f"(regression threshold {threshold:.0%}):")
+    regressions = []
+    for result in results:
+        old = before.get(result["id"])
+        if old is None:
+            print(f"  {result['id']:<60} new")
+            continue
+        change = result["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+        min_change = result["min_s"] / old["min_s"] - 1 if old["min_s"] else 0.0
+        flag = ""
+        if change > threshold and min_change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(result["id"])
+        print(f"  {result['id']:<60} {old['median_s'] * 1000:10.3f} -> "
+              f"{result['median_s'] * 1000:10.3f} ms  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Run the benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(CABIN_SIZES),
+                        help="cabin sizes in seats (default: %(default)s)")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--agents", type=int, default=4, help="processes in the contention case")
+    parser.add_argument("--refs", type=int, default=10000, help="booking refs to generate")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="baseline results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="median slowdown counted as a regression (default: %(default)s)")
+    args = parser.parse_args(argv[1:])
+
+    suite = Suite(args.repeats)
+    for case in args.cases:
+        if case == "refs":
+            case_refs(suite, args.refs)
+        for n_seats in args.sizes if case != "refs" else ():
+            if case == "seed":
+                case_seed(suite, n_seats)
+            elif case == "book":
+                case_book(suite, n_seats)
+            elif case == "contention":
+                case_contention(suite, n_seats, args.agents)
+            elif case == "flight":
+                case_flight(suite, n_seats)
+            elif case == "seatmap":
+                case_seatmap(suite, n_seats)
+
+    output = {"format": RESULTS_FORMAT, "environment": environment(),
+              "settings": {"sizes": args.sizes, "cases": args.cases, "repeats": args.repeats,
+                           "agents": args.agents, "refs": args.refs},
+              "results": suite.results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(suite.results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
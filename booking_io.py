@@ -0,0 +1,273 @@
+"""
+Streaming import/export of seat bookings as CSV or JSON Lines.
+
+    python booking_io.py export bookings.csv [--flight F] [--booked-only]
+    python booking_io.py import manifest.jsonl [--layout layouts/widebody.json] [--flight F]
+
+Rows have the fields in FIELDS. On import, flight_number defaults to --flight, status
+defaults to "booked" when the row has a booking_ref or passenger details, and a missing
+booking_ref is allocated. Rows are read and written one at a time and applied in chunks
+of --chunk-size, each in its own transaction, so memory use does not grow with the file.
+Invalid rows, and rows whose booking_ref belongs to another seat, are skipped and reported.
+
+Holds are not exported: a held seat is written as "free", since a hold only lasts a few
+minutes and its token belongs to the agent who took it. Import therefore accepts only
+"free" and "booked".
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from itertools import groupby, islice
+
+from database_manager import DEFAULT_FLIGHT, DatabaseManager, generate_unique_booking_ref
+from seat_allocator import split_seat_id
+
+FIELDS = ["flight_number", "seat_id", "status", "booking_ref", "passport_num", "first_name",
+          "last_name"]
+# Statuses a file may carry; held seats are exported as free
+STATUSES = {"free", "booked"}
+SEAT_ID_PATTERN = re.compile(r"^[1-9][0-9]*[A-Z]$")
+# Invalid rows reported individually before only counting them
+MAX_REPORTED_ERRORS = 20
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def read_rows(f, fmt, errors=None):
+    """
+    Yield (line, row dict) from an open CSV or JSONL file, numbering the rows from 1.
+    JSONL lines that do not hold a JSON object are skipped (recorded in `errors`, an
+    ErrorLog, if given).
+    """
+    if fmt == "csv":
+        yield from enumerate(csv.DictReader(f), start=1)
+        return
+    line = 0
+    for text in f:
+        if not text.strip():
+            continue
+        line += 1
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError as e:
+            problem = f"bad JSON ({e.msg})"
+        else:
+            if isinstance(row, dict):
+                yield line, row
+                continue
+            problem = f"expected a JSON object, got {type(row).__name__}"
+        if errors is not None:
+            errors.add(line, problem)
+
+
+def _field(row, name):
+    """A row value as stripped text ("" if missing); ValueError for lists and objects."""
+    value = row.get(name)
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        raise ValueError(f"bad {name} {value!r}")
+    return str(value).strip()
+
+
+def write_rows(f, fmt, rows):
+    """Write row dicts to an open file; returns the number written."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            f.write(json.dumps(row))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def export_bookings(db_manager, f, fmt="csv", flight_number=None, booked_only=False):
+    """Write seats (held ones as free) to an open file; returns the number written."""
+    rows = ({"flight_number": flight, "seat_id": seat_id,
+             "status": "free" if status == "held" else status, "booking_ref": ref,
+             "passport_num": passport, "first_name": first, "last_name": last}
+            for flight, seat_id, _, _, status, ref, passport, first, last
+            in db_manager.iter_seat_bookings(flight_number, booked_only))
+    return write_rows(f, fmt, rows)
+
+
+class ErrorLog:
+    """
+    Invalid rows seen during an import: the first `limit` as (line, problem) in `rows`,
+    and the number of all of them in `count`, so memory stays bounded.
+    """
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.rows = []
+        self.count = 0
+
+    def add(self, line, problem):
+        self.count += 1
+        if len(self.rows) < self.limit:
+            self.rows.append((line, problem))
+
+
+def validate_rows(rows, default_flight, layout=None, errors=None):
+    """
+    Normalise (line, row dict) pairs from read_rows into update_bookings-style records,
+    skipping invalid ones (recorded in `errors`, an ErrorLog, if given). Numbers are
+    taken as text. Seat ids are checked against the layout if one is given, otherwise
+    by their shape.
+    Yields (line, flight_number, (seat_id, booking_ref, passport_num, first_name, last_name,
+    status)).
+    """
+    for line, row in rows:
+        try:
+            seat_id = _field(row, "seat_id").upper()
+            flight_number = _field(row, "flight_number") or default_flight
+            booking_ref = _field(row, "booking_ref") or None
+            details = [_field(row, name) or None
+                       for name in ("passport_num", "first_name", "last_name")]
+            status = _field(row, "status").lower()
+        except ValueError as e:
+            if errors is not None:
+                errors.add(line, str(e))
+            continue
+        if not status:
+            status = "booked" if booking_ref or any(details) else "free"
+        if layout is not None:
+            problem = None if seat_id in layout else f"seat {seat_id!r} is not in the layout"
+        else:
+            problem = None if SEAT_ID_PATTERN.match(seat_id) else f"bad seat id {seat_id!r}"
+        if problem is None and status not in STATUSES:
+            problem = f"bad status {status!r}"
+        if problem is not None:
+            if errors is not None:
+                errors.add(line, problem)
+            continue
+        if status == "free":
+            booking_ref, details = None, [None, None, None]
+        yield line, flight_number, (seat_id, booking_ref, *details, status)
+
+
+def _check_chunk(db_manager, chunk, errors):
+    """
+    Drop rows of a chunk that the database would reject: a booking_ref listed twice, or
+    already belonging to another seat. A seat listed more than once keeps its last row,
+    as it would across chunks. Returns the remaining (flight_number, booking) records.
+    """
+    last_row = {(flight_number, booking[0]): i for i, (_, flight_number, booking) in enumerate(chunk)}
+    owners = db_manager.find_booking_refs({booking[1] for _, _, booking in chunk if booking[1]})
+    ref_lines = {}
+    records = []
+    for i, (line, flight_number, booking) in enumerate(chunk):
+        seat = (flight_number, booking[0])
+        if last_row[seat] != i:
+            continue
+        booking_ref = booking[1]
+        owner = owners.get(booking_ref, seat)
+        if booking_ref in ref_lines:
+            problem = f"booking_ref {booking_ref!r} is also on row {ref_lines[booking_ref]}"
+        elif owner != seat:
+            problem = f"booking_ref {booking_ref!r} belongs to seat {owner[1]} of {owner[0]}"
+        else:
+            if booking_ref:
+                ref_lines[booking_ref] = line
+            records.append((flight_number, booking))
+            continue
+        if errors is not None:
+            errors.add(line, problem)
+    return records
+
+
+def import_bookings(db_manager, f, fmt="csv", default_flight=DEFAULT_FLIGHT, layout=None,
+                    chunk_size=5000, errors=None):
+    """
+    Apply rows from an open file in chunks; returns the number of rows applied.
+    Seats missing from the database are created (from the layout when given).
+    Rows that are invalid or conflict with existing bookings are skipped and recorded
+    in `errors` (an ErrorLog) if given.
+    """
+    rows = validate_rows(read_rows(f, fmt, errors), default_flight, layout, errors)
+    seeded = set()
+    applied = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return applied
+        records = _check_chunk(db_manager, chunk, errors)
+        with db_manager.transaction():
+            for flight_number, group in groupby(records, key=lambda record: record[0]):
+                bookings = [booking for _, booking in group]
+                if flight_number not in seeded:
+                    seeded.add(flight_number)
+                    if layout is not None:
+                        db_manager.insert_seats(layout.seats(), flight_number)
+                if layout is None:
+                    db_manager.insert_seats(
+                        ((booking[0], *split_seat_id(booking[0])) for booking in bookings),
+                        flight_number)
+                db_manager.update_bookings(
+                    [(seat_id, booking_ref or (generate_unique_booking_ref(db_manager)
+                                               if status == "booked" else None),
+                      passport_num, first_name, last_name, status)
+                     for seat_id, booking_ref, passport_num, first_name, last_name, status in bookings],
+                    flight_number)
+        applied += len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export seat bookings (CSV/JSONL)")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="file to read or write ('-' for stdin/stdout)")
+    parser.add_argument("--db", default="apache_airlines.db")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from file extension")
+    parser.add_argument("--flight", help="export: only this flight; import: default flight")
+    parser.add_argument("--booked-only", action="store_true", help="export: only booked seats")
+    parser.add_argument("--layout", help="import: validate seat ids against this layout")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    fmt = detect_format(args.path, args.format)
+    db_manager = DatabaseManager(args.db)
+    start = time.perf_counter()
+    if args.command == "export":
+        f = sys.stdout if args.path == "-" else open(args.path, "w", newline="")
+        try:
+            count = export_bookings(db_manager, f, fmt, args.flight, args.booked_only)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+    else:
+        layout = None
+        if args.layout:
+            from aircraft_layout import load_layout
+            layout = load_layout(args.layout)
+        errors = ErrorLog()
+        f = sys.stdin if args.path == "-" else open(args.path, newline="")
+        try:
+            count = import_bookings(db_manager, f, fmt, args.flight or DEFAULT_FLIGHT, layout,
+                                    args.chunk_size, errors)
+        finally:
+            if f is not sys.stdin:
+                f.close()
+        for line, problem in errors.rows:
+            print(f"row {line}: {problem}", file=sys.stderr)
+        if errors.count:
+            print(f"{errors.count} invalid row(s) skipped", file=sys.stderr)
+    db_manager.close()
+    elapsed = time.perf_counter() - start
+    print(f"{args.command}ed {count} rows in {elapsed:.2f} s ({count / elapsed if elapsed else 0:,.0f} rows/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Headless booking service: check/book/free/status over a small local HTTP/JSON API.
+
+    python booking_service.py --db apache_airlines.db --port 8757 [--layout layouts/widebody.json]
+
+Endpoints (flight and seat ids as in DatabaseManager):
+    GET  /flights/<flight>/seats                 all seats with their status, plus counts
+    GET  /flights/<flight>/seats/<seat>          one seat's status
+    POST /flights/<flight>/seats/<seat>/book     body: {"passport_num", "first_name", "last_name"}
+    POST /flights/<flight>/seats/<seat>/free
+    GET  /metrics                                per-method database metrics (with --metrics)
+"""
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+from database_manager import OUTCOME_NOT_FOUND, OUTCOME_OK, DatabaseManager
+
+HTTP_STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                    409: "Conflict", 500: "Internal Server Error"}
+OUTCOME_HTTP_STATUS = {OUTCOME_OK: 200, OUTCOME_NOT_FOUND: 404}
+
+
+class BookingService:
+    """
+    Async facade over DatabaseManager.
+    Reads run on a pool of threads, each with its own SQLite connection (WAL lets them
+    proceed while a write is in progress). All writes go through a single writer thread,
+    so they are serialized in-process and never contend with each other for the lock.
+    With a DatabaseMetrics, every thread's DatabaseManager is instrumented by it.
+    """
+    def __init__(self, db_name, readers=4, metrics=None):
+        self.db_name = db_name
+        self.metrics = metrics
+        self._local = threading.local()
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+    def _db(self):
+        # One DatabaseManager per pool thread, created on first use; SQLite connections
+        # must stay on the thread that opened them, and are closed when it exits
+        db_manager = getattr(self._local, "db_manager", None)
+        if db_manager is None:
+            db_manager = self._local.db_manager = DatabaseManager(self.db_name)
+            if self.metrics is not None:
+                self.metrics.attach(db_manager)
+        return db_manager
+
+    async def _read(self, method_name, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, lambda: getattr(self._db(), method_name)(*args))
+
+    async def _write(self, method_name, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._writer, lambda: getattr(self._db(), method_name)(*args))
+
+    async def check(self, flight_number, seat_id):
+        return await self._read("get_seat_status", seat_id, flight_number)
+
+    async def status(self, flight_number):
+        return await self._read("get_all_seats", flight_number)
+
+    async def book(self, flight_number, seat_id, passport_num=None, first_name=None, last_name=None):
+        return await self._write("book_seat_atomic", seat_id, passport_num, first_name, last_name,
+                                 flight_number)
+
+    async def free(self, flight_number, seat_id):
+        return await self._write("free_seat_atomic", seat_id, flight_number)
+
+    def seed(self, seats, flight_number):
+        self._writer.submit(lambda: self._db().insert_seats(seats, flight_number)).result()
+
+    def close(self):
+        self._readers.shutdown()
+        self._writer.shutdown()
+
+    async def handle(self, method, path, body):
+        """Route one request; returns (http_status, json_payload)."""
+        parts = [unquote(part) for part in path.split("?")[0].strip("/").split("/")]
+        if parts == ["metrics"] and self.metrics is not None:
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.metrics.snapshot()
+        if len(parts) < 3 or parts[0] != "flights" or parts[2] != "seats":
+            return 404, {"error": "unknown path"}
+        flight_number = parts[1]
+        if len(parts) == 3:
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            seats = await self.status(flight_number)
+            counts = {}
+            for _, status in seats:
+                counts[status] = counts.get(status, 0) + 1
+            return 200, {"flight_number": flight_number, "counts": counts,
+                         "seats": [{"seat_id": seat_id, "status": status} for seat_id, status in seats]}
+        seat_id = parts[3]
+        if len(parts) == 4:
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            status = await self.check(flight_number, seat_id)
+            if status is None:
+                return 404, {"seat_id": seat_id, "error": "no such seat"}
+            return 200, {"seat_id": seat_id, "status": status}
+        if len(parts) == 5 and parts[4] in ("book", "free"):
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            if parts[4] == "free":
+                outcome = await self.free(flight_number, seat_id)
+                return OUTCOME_HTTP_STATUS.get(outcome, 409), {"seat_id": seat_id, "outcome": outcome}
+            try:
+                details = json.loads(body) if body else {}
+            except ValueError:
+                return 400, {"error": "body must be JSON"}
+            if not isinstance(details, dict):
+                return 400, {"error": "body must be a JSON object"}
+            for name in ("passport_num", "first_name", "last_name"):
+                if not isinstance(details.get(name), (str, type(None))):
+                    return 400, {"error": f"{name} must be a string or null"}
+            outcome, booking_ref = await self.book(flight_number, seat_id, details.get("passport_num"),
+                                                   details.get("first_name"), details.get("last_name"))
+            return OUTCOME_HTTP_STATUS.get(outcome, 409), {"seat_id": seat_id, "outcome": outcome,
+                                                           "booking_ref": booking_ref}
+        return 404, {"error": "unknown path"}
+
+    async def serve_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one (keep-alive) connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be skipped, so the
+                    # connection is closed after the error
+                    status, payload, keep_alive = 400, {"error": "bad Content-Length"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.handle(method, path, body)
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8757):
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+async def _serve(args):
+    metrics = None
+    if args.metrics is not None:
+        from db_metrics import DatabaseMetrics
+        metrics = DatabaseMetrics()
+        if args.metrics > 0:
+            metrics.start_logging(args.metrics)
+    service = BookingService(args.db, args.readers, metrics)
+    if args.layout:
+        from aircraft_layout import load_layout
+        layout = load_layout(args.layout)
+        service.seed(list(layout.seats()), args.flight or layout.name)
+    server = await service.start(args.host, args.port)
+    print(f"Serving {args.db} on http://{args.host}:{args.port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if metrics is not None:
+            metrics.stop_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", default="apache_airlines.db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8757)
+    parser.add_argument("--readers", type=int, default=4, help="reader connection pool size")
+    parser.add_argument("--layout", help="seed seats from this aircraft layout before serving")
+    parser.add_argument("--flight", help="flight number for --layout (default: layout name)")
+    parser.add_argument("--metrics", type=float, metavar="SECONDS",
+                        help="record database metrics (GET /metrics) and log a summary "
+                             "every SECONDS (0: no log)")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,79 @@
-from database_manager import *
+from database_manager import (HOLD_TTL_SECONDS, OUTCOME_NOT_FOUND, OUTCOME_UNAVAILABLE,
+                              DatabaseManager, split_passenger_name)
+from seat_cache import SeatCache
+from aircraft_layout import DEFAULT_LAYOUT_PATH, load_layout
+from db_worker import DatabaseWorker
+import time
 import tkinter as tk
 from tkinter import messagebox
 
+# How often to check whether another process changed the database (milliseconds)
+EXTERNAL_POLL_MS = 1000
+
+# Button colors (background, foreground) per seat status
+SEAT_COLORS = {"free": ("green", "black"), "booked": ("red", "white"), "held": ("orange", "black")}
+UNKNOWN_SEAT_COLORS = ("gray", "white")
+
+# With renderer="auto", cabins with more seats than this are drawn on a canvas
+CANVAS_RENDERER_MIN_SEATS = 150
+
 class BookingSystemGUI:
-    def __init__(self, master):
+    def __init__(self, master, db_name="apache_airlines.db", layout_path=DEFAULT_LAYOUT_PATH,
+                 flight_number=None, renderer="auto"):
         self.master = master
         self.master.title("Apache Airlines Seat Booking (SQLite)")
-        # Initialize the database manager
-        self.db_manager = DatabaseManager()
-
-        # Define airplane layout:
-        # - 6 rows
-        # - Left group: seats A & B; Right group: seats C & D (with an aisle in between)
-        self.rows = range(1, 7)
-        self.left_group = ["A", "B"]
-        self.right_group = ["C", "D"]
-
-        # Insert seats into the database
-        for row in self.rows:
-            for seat in self.left_group + self.right_group:
-                seat_id = f"{row}{seat}"
-                self.db_manager.insert_seat(seat_id, row, seat)
-
-        # Build the UI panels
+        # Initialize the database manager; it connects on first use, in _load_seats
+        self.db_manager = DatabaseManager(db_name)
+        # Seat reads are served from memory; mutations write through to the database
+        self.seat_cache = SeatCache(self.db_manager)
+        # Bookings and frees run on a background thread so a locked database cannot freeze the UI
+        self.db_worker = DatabaseWorker(self.master, db_name)
+
+        # Airplane layout (cabins, rows, seat letters, aisles) comes from an aircraft config;
+        # the flight defaults to the layout's name
+        self.layout = load_layout(layout_path)
+        self.seat_canvas = None
+        self.flight_number = flight_number or self.layout.name
+
+        # Build the UI panels; the seat map is a grid of buttons, or a single scrolling
+        # canvas ("canvas") that only draws the visible rows
+        if renderer == "auto":
+            renderer = "canvas" if len(self.layout) > CANVAS_RENDERER_MIN_SEATS else "buttons"
         self.build_left_panel()
-        self.build_seat_map()
+        if renderer == "canvas":
+            self.build_seat_canvas()
+        else:
+            self.build_seat_map()
+
+        self._pending_seat_changes = {}
+        self._flush_scheduled = False
+        # Hold tokens for seats this agent is holding, and the timer that frees expired
+        # holds at the earliest deadline
+        self._holds = {}
+        self._reaper_after_id = None
+        # Set when a seat becomes held, so the poller re-arms the reaper for other agents' holds
+        self._saw_hold = False
 
-        # Refresh the seat map colors from the database
+        # The window only needs the layout; the database is opened and read once Tk is idle,
+        # so the window appears without waiting for it
+        self.master.after_idle(self._load_seats)
+
+    def _load_seats(self):
+        """
+        Seed the flight's seats (skipped when the database already has this layout), paint
+        the seat map from the database, then follow changes: seat-change events repaint
+        only the buttons that changed.
+        """
+        try:
+            if self.seat_cache.seed_seats(self.layout.seats(), self.flight_number, self.layout.key):
+                self.seat_cache.invalidate(self.flight_number)
+        except ValueError as e:
+            # The stored seats are kept; the map shows them against the new layout
+            messagebox.showerror("Layout not applied", str(e))
         self.update_seat_map()
+        self.seat_cache.add_listener(self._on_seat_changed)
+        self.master.after(EXTERNAL_POLL_MS, self.poll_external_changes)
+        self._schedule_hold_reaper()
 
     def build_left_panel(self):
         left_frame = tk.Frame(self.master)
@@ -57,50 +103,60 @@ class BookingSystemGUI:
         self.show_status_button = tk.Button(left_frame, text="Show Booking Status", command=self.show_booking_status)
         self.show_status_button.grid(row=4, column=1, padx=5, pady=5)
 
+        self.hold_button = tk.Button(left_frame, text="Hold Seat", command=self.hold_seat)
+        self.hold_button.grid(row=5, column=0, padx=5, pady=5)
+
+        self.cancel_button = tk.Button(left_frame, text="Cancel Pending", command=self.cancel_pending)
+        self.cancel_button.grid(row=5, column=1, padx=5, pady=5)
+
+        self.search_button = tk.Button(left_frame, text="Find Passenger", command=self.find_passenger)
+        self.search_button.grid(row=6, column=0, columnspan=2, padx=5, pady=5)
+
         self.exit_button = tk.Button(left_frame, text="Exit", command=self.on_exit)
-        self.exit_button.grid(row=5, column=0, columnspan=2, pady=10)
+        self.exit_button.grid(row=7, column=0, columnspan=2, pady=10)
 
     def build_seat_map(self):
         """
         This is constructs the right panel displaying an airplane-like seat map.
-        Layout:
-          - Header row: Left group seat labels, an empty cell for the aisle, and right group seat labels.
-          - Each row starts with a row number, then seat buttons for left group, an aisle separator, then right group.
+        Layout (cell positions are precomputed by the aircraft layout):
+          - Each cabin starts with a header row of seat letters, with empty cells for the aisles.
+          - Each row starts with a row number, then seat buttons with aisle separators between groups.
         """
         self.seat_map_frame = tk.Frame(self.master, bd=2, relief=tk.SUNKEN)
         self.seat_map_frame.pack(side=tk.LEFT, padx=10, pady=10)
 
-        # Header row
-        tk.Label(self.seat_map_frame, text="").grid(row=0, column=0, padx=5, pady=5)
-        for i, seat in enumerate(self.left_group):
-            tk.Label(self.seat_map_frame, text=seat, font=("Arial", 10, "bold"))\
-                .grid(row=0, column=i+1, padx=5, pady=5)
-        tk.Label(self.seat_map_frame, text="").grid(row=0, column=3, padx=20, pady=5)  # Aisle separator
-        for i, seat in enumerate(self.right_group):
-            tk.Label(self.seat_map_frame, text=seat, font=("Arial", 10, "bold"))\
-                .grid(row=0, column=i+4, padx=5, pady=5)
-
-        # Create seat buttons for each row
-        self.seat_buttons = {}
-        for row in self.rows:
+        # Header rows
+        for grid_row, columns in self.layout.headers:
+            tk.Label(self.seat_map_frame, text="").grid(row=grid_row, column=0, padx=5, pady=5)
+            for grid_col, seat in columns:
+                tk.Label(self.seat_map_frame, text=seat, font=("Arial", 10, "bold"))\
+                    .grid(row=grid_row, column=grid_col, padx=5, pady=5)
+        # Aisle separators (empty column)
+        for grid_col in self.layout.aisle_columns():
+            tk.Label(self.seat_map_frame, text="").grid(row=0, column=grid_col, padx=20, pady=5)
+
+        # Row labels and a seat button for each seat
+        for grid_row, row in self.layout.row_labels:
             tk.Label(self.seat_map_frame, text=str(row), font=("Arial", 10, "bold"))\
-                .grid(row=row, column=0, padx=5, pady=5)
-            # Left group seats
-            for i, seat in enumerate(self.left_group):
-                seat_id = f"{row}{seat}"
-                btn = tk.Button(self.seat_map_frame, text=seat_id, width=4,
-                                command=lambda s=seat_id: self.seat_button_click(s))
-                btn.grid(row=row, column=i+1, padx=2, pady=2)
-                self.seat_buttons[seat_id] = btn
-            # Aisle separator (empty cell)
-            tk.Label(self.seat_map_frame, text="").grid(row=row, column=3, padx=20, pady=2)
-            # Right group seats
-            for i, seat in enumerate(self.right_group):
-                seat_id = f"{row}{seat}"
-                btn = tk.Button(self.seat_map_frame, text=seat_id, width=4,
-                                command=lambda s=seat_id: self.seat_button_click(s))
-                btn.grid(row=row, column=i+4, padx=2, pady=2)
-                self.seat_buttons[seat_id] = btn
+                .grid(row=grid_row, column=0, padx=5, pady=5)
+        self.seat_buttons = {}
+        layout = self.layout
+        for seat_id, grid_row, grid_col in zip(layout.seat_ids, layout.grid_rows, layout.grid_cols):
+            btn = tk.Button(self.seat_map_frame, text=seat_id, width=4,
+                            command=lambda s=seat_id: self.seat_button_click(s))
+            btn.grid(row=grid_row, column=grid_col, padx=2, pady=2)
+            self.seat_buttons[seat_id] = btn
+
+    def build_seat_canvas(self):
+        """
+        Canvas-based alternative to build_seat_map for large cabins.
+        Clicking a seat behaves like clicking its button.
+        """
+        from seat_canvas import CanvasSeatMap
+        self.seat_buttons = {}
+        self.seat_canvas = CanvasSeatMap(self.master, self.layout, self.seat_button_click,
+                                         SEAT_COLORS, UNKNOWN_SEAT_COLORS)
+        self.seat_canvas.pack(side=tk.LEFT, padx=10, pady=10, fill=tk.Y)
 
     def seat_button_click(self, seat_id):
         """
@@ -114,23 +170,59 @@ class BookingSystemGUI:
         Update each seat button's color based on its booking status:
           - Green for free.
           - Red for booked.
+          - Orange for held.
         """
-        all_seats = {seat_id: status for seat_id, status in self.db_manager.get_all_seats()}
+        all_seats = dict(self.seat_cache.get_all_seats(self.flight_number))
+        if self.seat_canvas is not None:
+            self.seat_canvas.set_statuses(all_seats)
         for seat_id, btn in self.seat_buttons.items():
-            status = all_seats.get(seat_id)
-            if status == "free":
-                btn.config(bg="green", fg="black")
-            elif status == "booked":
-                btn.config(bg="red", fg="white")
-            else:
-                btn.config(bg="gray", fg="white")
+            self._paint_seat(btn, all_seats.get(seat_id))
+
+    def _paint_seat(self, btn, status):
+        bg, fg = SEAT_COLORS.get(status, UNKNOWN_SEAT_COLORS)
+        btn.config(bg=bg, fg=fg)
+
+    def _on_seat_changed(self, flight_number, seat_id, status):
+        """
+        Seat-change events are collected and repainted together once Tk is idle,
+        so a burst of changes costs a single pass over just the affected buttons.
+        """
+        if flight_number != self.flight_number:
+            return
+        if status == "held":
+            self._saw_hold = True
+        self._pending_seat_changes[seat_id] = status
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.master.after_idle(self._flush_seat_changes)
+
+    def _flush_seat_changes(self):
+        changes, self._pending_seat_changes = self._pending_seat_changes, {}
+        self._flush_scheduled = False
+        for seat_id, status in changes.items():
+            btn = self.seat_buttons.get(seat_id)
+            if btn is not None:
+                self._paint_seat(btn, status)
+            elif self.seat_canvas is not None:
+                self.seat_canvas.set_status(seat_id, status)
+
+    def poll_external_changes(self):
+        """
+        Pick up bookings made by other agents on the same database file.
+        Changed seats arrive through _on_seat_changed; a new hold re-arms the reaper, so
+        it is released even if the agent holding it quits.
+        """
+        self._saw_hold = False
+        if self.seat_cache.sync() and self._saw_hold:
+            self._schedule_hold_reaper()
+        self.master.after(EXTERNAL_POLL_MS, self.poll_external_changes)
 
     def check_seat(self):
         seat_id = self.seat_entry.get().strip()
         if not seat_id:
             messagebox.showwarning("Warning", "Please enter a seat ID.")
             return
-        status = self.db_manager.get_seat_status(seat_id)
+        status = self.seat_cache.get_seat_status(seat_id, self.flight_number)
         if status is None:
             messagebox.showerror("Error", f"Seat {seat_id} does not exist.")
         else:
@@ -138,47 +230,153 @@ class BookingSystemGUI:
 
     def book_seat(self):
         seat_id = self.seat_entry.get().strip()
-        passenger_name = self.name_entry.get().strip() or None
+        first_name, last_name = split_passenger_name(self.name_entry.get())
         passport_num = self.passport_entry.get().strip() or None
         if not seat_id:
             messagebox.showwarning("Warning", "Please enter a seat ID.")
             return
-        status = self.db_manager.get_seat_status(seat_id)
-        if status is None:
+        self.db_worker.submit(
+            "book_seat", "book_seat_atomic",
+            (seat_id, passport_num, first_name, last_name, self.flight_number,
+             self._holds.get(seat_id)),
+            callback=lambda result: self._on_seat_booked(seat_id, *result),
+            errback=self._on_db_error)
+
+    def _on_seat_booked(self, seat_id, outcome, booking_ref):
+        if outcome == OUTCOME_NOT_FOUND:
             messagebox.showerror("Error", f"Seat {seat_id} does not exist.")
             return
-        if status == "booked":
-            messagebox.showerror("Error", f"Seat {seat_id} is already booked.")
+        if outcome == OUTCOME_UNAVAILABLE:
+            messagebox.showerror("Error", f"Seat {seat_id} is already booked or held.")
+            self.seat_cache.sync()
             return
-        # Generate unique booking reference
-        booking_ref = generate_unique_booking_ref(self.db_manager)
-        self.db_manager.update_seat_booking(seat_id, booking_ref, passport_num, passenger_name, None, "booked")
+        self._holds.pop(seat_id, None)
+        self.seat_cache.apply(self.flight_number, seat_id, "booked")
         messagebox.showinfo("Success", f"Seat {seat_id} has been booked with reference {booking_ref}.")
-        self.update_seat_map()
+
+    def hold_seat(self):
+        """
+        Hold the seat for HOLD_TTL_SECONDS while passenger details are collected;
+        Book Seat then completes the booking, Free Seat releases the hold.
+        """
+        seat_id = self.seat_entry.get().strip()
+        if not seat_id:
+            messagebox.showwarning("Warning", "Please enter a seat ID.")
+            return
+        self.db_worker.submit(
+            "hold_seat", "hold_seat_atomic", (seat_id, HOLD_TTL_SECONDS, self.flight_number),
+            callback=lambda result: self._on_seat_held(seat_id, *result),
+            errback=self._on_db_error)
+
+    def _on_seat_held(self, seat_id, outcome, hold_token):
+        if outcome == OUTCOME_NOT_FOUND:
+            messagebox.showerror("Error", f"Seat {seat_id} does not exist.")
+            return
+        if outcome == OUTCOME_UNAVAILABLE:
+            messagebox.showerror("Error", f"Seat {seat_id} is not free.")
+            self.seat_cache.sync()
+            return
+        self._holds[seat_id] = hold_token
+        self.seat_cache.apply(self.flight_number, seat_id, "held")
+        self._schedule_hold_reaper()
+        messagebox.showinfo("Held", f"Seat {seat_id} is held for {HOLD_TTL_SECONDS} seconds.")
+
+    def _schedule_hold_reaper(self):
+        """
+        Arm a single timer for the earliest hold deadline rather than checking every seat.
+        The deadline is looked up on the database worker.
+        """
+        self.db_worker.submit("next_hold_expiry", "next_hold_expiry", (),
+                              callback=self._arm_hold_reaper, errback=self._on_db_error)
+
+    def _arm_hold_reaper(self, expiry):
+        if self._reaper_after_id is not None:
+            self.master.after_cancel(self._reaper_after_id)
+            self._reaper_after_id = None
+        if expiry is not None:
+            delay_ms = max(0, int((expiry - time.time()) * 1000))
+            self._reaper_after_id = self.master.after(delay_ms, self._reap_expired_holds)
+
+    def _reap_expired_holds(self):
+        self._reaper_after_id = None
+        self.db_worker.submit(
+            "release_expired_holds", "release_expired_holds", (),
+            callback=self._on_holds_reaped, errback=self._on_db_error)
+
+    def _on_holds_reaped(self, count):
+        # The worker wrote on its own connection, so sync() repaints the freed seats
+        self.seat_cache.sync()
+        self._holds = {seat_id: token for seat_id, token in self._holds.items()
+                       if self.seat_cache.get_seat_status(seat_id, self.flight_number) == "held"}
+        self._schedule_hold_reaper()
 
     def free_seat(self):
         seat_id = self.seat_entry.get().strip()
         if not seat_id:
             messagebox.showwarning("Warning", "Please enter a seat ID.")
             return
-        status = self.db_manager.get_seat_status(seat_id)
-        if status is None:
+        if seat_id in self._holds:
+            self.db_worker.submit(
+                "release_hold", "release_hold",
+                (seat_id, self._holds[seat_id], self.flight_number),
+                callback=lambda outcome: self._on_seat_freed(seat_id, outcome),
+                errback=self._on_db_error)
+            return
+        self.db_worker.submit(
+            "free_seat", "free_seat_atomic", (seat_id, self.flight_number),
+            callback=lambda outcome: self._on_seat_freed(seat_id, outcome),
+            errback=self._on_db_error)
+
+    def _on_seat_freed(self, seat_id, outcome):
+        if outcome == OUTCOME_NOT_FOUND:
             messagebox.showerror("Error", f"Seat {seat_id} does not exist.")
             return
-        if status == "free":
-            messagebox.showerror("Error", f"Seat {seat_id} is already free.")
+        if outcome == OUTCOME_UNAVAILABLE:
+            # Only booked seats can be freed; a seat held by another agent is not free either
+            self.seat_cache.sync()
+            if self.seat_cache.get_seat_status(seat_id, self.flight_number) == "held":
+                messagebox.showerror("Error", f"Seat {seat_id} is held by another agent.")
+            else:
+                messagebox.showerror("Error", f"Seat {seat_id} is already free.")
             return
-        self.db_manager.update_seat_booking(seat_id, None, None, None, None, "free")
+        self._holds.pop(seat_id, None)
+        self.seat_cache.apply(self.flight_number, seat_id, "free")
         messagebox.showinfo("Success", f"Seat {seat_id} is now free.")
-        self.update_seat_map()
+
+    def _on_db_error(self, error):
+        messagebox.showerror("Database Error", str(error))
+
+    def cancel_pending(self):
+        """
+        Cancel queued bookings/frees that have not started; one already running completes
+        and is reported as usual.
+        """
+        count = self.db_worker.cancel_all()
+        messagebox.showinfo("Cancelled", f"Cancelled {count} pending operation(s).")
 
     def show_booking_status(self):
-        seats = self.db_manager.get_all_seats()
-        status_text = "Current Seat Status:\n\n"
-        for seat_id, status in seats:
-            status_text += f"{seat_id}: {status}\n"
-        messagebox.showinfo("Booking Status", status_text)
+        """
+        Open the status window: counts computed in SQL and paginated seat/flight tables,
+        all queried on the database worker.
+        """
+        from status_view import StatusView
+        StatusView(self.master, self.db_worker, self.flight_number, self.layout)
+
+    def find_passenger(self):
+        """
+        Open the passenger search window; double-clicking a booking on this flight
+        selects its seat.
+        """
+        from search_view import PassengerSearchView
+        PassengerSearchView(self.master, self.db_worker, self._on_passenger_selected)
+
+    def _on_passenger_selected(self, flight_number, seat_id):
+        if flight_number == self.flight_number:
+            self.seat_button_click(seat_id)
 
     def on_exit(self):
+        if self._reaper_after_id is not None:
+            self.master.after_cancel(self._reaper_after_id)
+        self.db_worker.stop()
         self.db_manager.close()
         self.master.quit()
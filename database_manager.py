@@ -1,72 +1,1123 @@
+import difflib
+import secrets
 import sqlite3
-import random
 import string
+import time
+import unicodedata
+from contextlib import contextmanager
+
+from seat_allocator import SeatAllocator, rows_from_layout
+
+# Flight used by callers that predate the multi-flight schema (and by migrated databases)
+DEFAULT_FLIGHT = "Burak757"
+
+# Bumped whenever create_table() learns a new migration step
+SCHEMA_VERSION = 5
+
+# Outcomes returned by book_seat_atomic() / free_seat_atomic()
+OUTCOME_OK = "ok"
+OUTCOME_UNAVAILABLE = "unavailable"  # seat exists but is not in the required state
+OUTCOME_NOT_FOUND = "not_found"
+
+# How long hold_seat_atomic() keeps a seat by default (seconds)
+HOLD_TTL_SECONDS = 300
+
+# Booking references are 8 characters from this alphabet
+REF_ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase
+REF_LENGTH = 8
+REF_SPACE = len(REF_ALPHABET) ** REF_LENGTH
+# Multiplier coprime with REF_SPACE, so scrambling sequence numbers is a bijection
+REF_MULTIPLIER = 134_941_606_347_813
+REF_OFFSET = 91_254_367_103
+
+# Upper bound appended to a prefix for index range scans (prefix <= value < prefix + this)
+PREFIX_END = "\U0010ffff"
 
 class DatabaseManager:
-    def __init__(self, db_name="apache_airlines.db"):
+    def __init__(self, db_name="apache_airlines.db", busy_timeout=5.0, busy_retries=3):
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
+        # The connection is opened (and the schema checked) on first use, so creating a
+        # manager costs nothing until the database is actually needed
+        self._conn = None
+        self._cursor = None
+        self._has_search_index = False
+        self.busy_timeout = busy_timeout
+        self.busy_retries = busy_retries
+        # Number of times a write had to be retried after the busy timeout expired, and the
+        # time those retries cost: the failed attempt (mostly SQLite waiting out the busy
+        # timeout) plus the backoff. A lock obtained within the timeout is not counted.
+        self.busy_retry_count = 0
+        self.busy_wait_seconds = 0.0
+        # Depth of nested transaction() scopes; commits are deferred while > 0
+        self._transaction_depth = 0
+        # Seat-change callbacks, and the changes waiting for the current transaction to commit
+        self._listeners = []
+        self._pending_events = []
+        self.ref_allocator = BookingRefAllocator(self)
+        # flight_number -> (layout_key, SeatAllocator) for find_best_seats, kept current by
+        # this manager's seat changes and by the event log for other connections' changes
+        self._allocators = {}
+        self._allocator_data_version = None
+        self._allocator_event_id = 0
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._connect()
+        return self._conn
+
+    @property
+    def cursor(self):
+        if self._cursor is None:
+            self._connect()
+        return self._cursor
+
+    @property
+    def has_search_index(self):
+        """True when the FTS5 passenger index exists (see search_passengers)."""
+        if self._conn is None:
+            self._connect()
+        return self._has_search_index
+
+    def _connect(self):
+        # sqlite3 waits up to `timeout` seconds on a locked database before raising
+        self._conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout)
+        self._conn.execute("PRAGMA foreign_keys = ON;")
+        # WAL lets readers proceed while another process holds the write lock
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._cursor = self._conn.cursor()
         self.create_table()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several changes into a single commit.
+        Scopes may be nested; only the outermost one commits (or rolls back on error).
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+                self.ref_allocator.reset()
+                self._pending_events.clear()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.commit()
+                self._dispatch_events()
+
+    def _commit(self):
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
+    def add_listener(self, callback):
+        """
+        Register callback(flight_number, seat_id, status), called after each committed
+        change of a seat's status made through this manager.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _emit(self, flight_number, seat_id, status):
+        # Held back until the enclosing transaction commits; dropped if it rolls back
+        if self._listeners or self._allocators:
+            self._pending_events.append((flight_number, seat_id, status))
+
+    def _dispatch_events(self):
+        events, self._pending_events = self._pending_events, []
+        for flight_number, seat_id, status in events:
+            entry = self._allocators.get(flight_number)
+            if entry is not None:
+                entry[1].set_free(seat_id, status == "free")
+            for callback in list(self._listeners):
+                callback(flight_number, seat_id, status)
+
+    def _retry_busy(self, operation):
+        """
+        Run operation(), retrying with backoff if the database stays locked past the busy
+        timeout. Inside an enclosing transaction() the error is raised instead, since the
+        outer scope's work has already been rolled back.
+        """
+        for attempt in range(self.busy_retries + 1):
+            started = time.perf_counter()
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                locked = "locked" in str(e) or "busy" in str(e)
+                if not locked or self._transaction_depth or attempt == self.busy_retries:
+                    raise
+                self.busy_retry_count += 1
+                delay = 0.05 * 2 ** attempt
+                self.busy_wait_seconds += time.perf_counter() - started + delay
+                time.sleep(delay)
+
     def create_table(self):
-        query = """
-        CREATE TABLE IF NOT EXISTS seat_bookings (
-            seat_id TEXT PRIMARY KEY,
+        """
+        Create the flights/seats/bookings schema, migrating a legacy single-aircraft
+        `seat_bookings` table into it if one is found. A database already at
+        SCHEMA_VERSION is left as it is, at the cost of one PRAGMA.
+        """
+        version = self.cursor.execute("PRAGMA user_version;").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            self._has_search_index = self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'passenger_search';").fetchone() is not None
+            return
+        self.cursor.executescript("""
+        CREATE TABLE IF NOT EXISTS flights (
+            flight_number TEXT PRIMARY KEY,
+            -- Layout the flight's seats were created from, see seed_seats()
+            layout_key TEXT
+        );
+        CREATE TABLE IF NOT EXISTS seats (
+            flight_number TEXT NOT NULL REFERENCES flights (flight_number),
+            seat_id TEXT NOT NULL,
             seat_row INTEGER,
             seat_col TEXT,
-            booking_ref TEXT UNIQUE,
+            status TEXT NOT NULL DEFAULT 'free',
+            held_until REAL,
+            hold_token TEXT,
+            PRIMARY KEY (flight_number, seat_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS bookings (
+            booking_ref TEXT PRIMARY KEY,
+            flight_number TEXT NOT NULL,
+            seat_id TEXT NOT NULL,
             passport_num TEXT,
             first_name TEXT,
             last_name TEXT,
-            status TEXT
+            first_name_norm TEXT,
+            last_name_norm TEXT,
+            UNIQUE (flight_number, seat_id),
+            FOREIGN KEY (flight_number, seat_id) REFERENCES seats (flight_number, seat_id)
+        );
+        -- Availability queries ("free seats on flight X") are answered from this index alone
+        CREATE INDEX IF NOT EXISTS idx_seats_status ON seats (flight_number, status, seat_id);
+        -- Cabin order, for per-row counts and keyset pagination of a flight's seats
+        CREATE INDEX IF NOT EXISTS idx_seats_position ON seats (flight_number, seat_row, seat_col);
+        CREATE INDEX IF NOT EXISTS idx_bookings_passport
+            ON bookings (passport_num, flight_number, seat_id);
+        -- Every word of every normalized passenger name, for suggesting spellings
+        CREATE TABLE IF NOT EXISTS passenger_terms (
+            term TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+        -- Next unreserved booking reference number, see BookingRefAllocator
+        CREATE TABLE IF NOT EXISTS ref_sequence (
+            name TEXT PRIMARY KEY,
+            next_value INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO ref_sequence (name, next_value) VALUES ('booking_ref', 1);
+        -- Append-only history of seat changes, written in the transaction of each change
+        CREATE TABLE IF NOT EXISTS booking_events (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            flight_number TEXT NOT NULL,
+            seat_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            booking_ref TEXT,
+            passport_num TEXT,
+            first_name TEXT,
+            last_name TEXT
         );
+        -- Latest event of a seat at or before a time is one seek here (see get_seats_as_of)
+        CREATE INDEX IF NOT EXISTS idx_booking_events_seat
+            ON booking_events (flight_number, seat_id, ts);
+        CREATE INDEX IF NOT EXISTS idx_booking_events_ts ON booking_events (ts);
+        CREATE TRIGGER IF NOT EXISTS booking_events_no_update BEFORE UPDATE ON booking_events
+        BEGIN SELECT RAISE(ABORT, 'booking_events is append-only'); END;
+        CREATE TRIGGER IF NOT EXISTS booking_events_no_delete BEFORE DELETE ON booking_events
+        BEGIN SELECT RAISE(ABORT, 'booking_events is append-only'); END;
+        """)
+
+        legacy = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seat_bookings';"
+        ).fetchone()
+        if legacy:
+            self._migrate_legacy_seat_bookings()
+        if version < 2:
+            self._add_missing_columns("seats", [("held_until", "REAL"), ("hold_token", "TEXT")])
+        # Names are split before the history is seeded, so the seed events carry the
+        # same first/last name as the bookings rows
+        if version < 4:
+            self._add_missing_columns("bookings", [("first_name_norm", "TEXT"),
+                                                   ("last_name_norm", "TEXT")])
+            self._normalize_booking_names()
+        if version < 3:
+            self._log_current_state()
+        if version < 5:
+            self._add_missing_columns("flights", [("layout_key", "TEXT")])
+        # Exact and prefix lookups by normalized name (see find_bookings_by_name)
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bookings_name
+        ON bookings (last_name_norm, first_name_norm);
+        """)
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bookings_first_name ON bookings (first_name_norm);
+        """)
+        self._has_search_index = self._create_search_index()
+        # Only held seats are in this index, so the reaper's range scan touches just those
+        self.cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_seats_held_until ON seats (held_until)
+        WHERE held_until IS NOT NULL;
+        """)
+
+        # Read-only view with the old single-table shape, for ad-hoc queries and exports
+        self.cursor.execute("""
+        CREATE VIEW IF NOT EXISTS seat_bookings AS
+        SELECT s.flight_number, s.seat_id, s.seat_row, s.seat_col, b.booking_ref,
+               b.passport_num, b.first_name, b.last_name, s.status
+        FROM seats s
+        LEFT JOIN bookings b ON b.flight_number = s.flight_number AND b.seat_id = s.seat_id;
+        """)
+        self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        self._commit()
+
+    def _add_missing_columns(self, table, columns):
+        existing = {row[1] for row in self.cursor.execute(f"PRAGMA table_info({table});")}
+        for name, column_type in columns:
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type};")
+
+    def _log_current_state(self):
+        """
+        Start the history of an existing database: one event, stamped now, for every seat
+        that is not free and has no events yet (seats without events count as free).
+        """
+        self.cursor.execute("""
+        INSERT INTO booking_events
+        (ts, flight_number, seat_id, status, booking_ref, passport_num, first_name, last_name)
+        SELECT ?, s.flight_number, s.seat_id, s.status, b.booking_ref, b.passport_num,
+               b.first_name, b.last_name
+        FROM seats s
+        LEFT JOIN bookings b ON b.flight_number = s.flight_number AND b.seat_id = s.seat_id
+        WHERE s.status <> 'free' AND NOT EXISTS (
+            SELECT 1 FROM booking_events e
+            WHERE e.flight_number = s.flight_number AND e.seat_id = s.seat_id);
+        """, (time.time(),))
+
+    def _normalize_booking_names(self):
+        """
+        Fill the normalized name columns of existing bookings. Rows written by the old GUI
+        hold the whole name in first_name; those are split into first and last name.
+        """
+        self.cursor.execute("SELECT rowid, first_name, last_name FROM bookings;")
+        updates = []
+        for rowid, first_name, last_name in self.cursor.fetchall():
+            if last_name is None and first_name is not None:
+                first_name, last_name = split_passenger_name(first_name)
+            updates.append((first_name, last_name, normalize_name(first_name),
+                            normalize_name(last_name), rowid))
+        self.cursor.executemany("""
+        UPDATE bookings SET first_name = ?, last_name = ?, first_name_norm = ?, last_name_norm = ?
+        WHERE rowid = ?;
+        """, updates)
+        self._add_name_terms(name for update in updates for name in update[2:4])
+
+    def _add_name_terms(self, names):
+        """Record the words of normalized names in passenger_terms."""
+        terms = {term for name in names if name for term in name.split()}
+        self.cursor.executemany("INSERT OR IGNORE INTO passenger_terms (term) VALUES (?);",
+                                ((term,) for term in terms))
+
+    def _create_search_index(self):
+        """
+        Create the FTS5 index over passenger names, kept in step with bookings by triggers.
+        Returns False when this SQLite build has no FTS5; search then uses the name indexes.
+        """
+        exists = self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'passenger_search';").fetchone()
+        if exists:
+            return True
+        try:
+            # External content: the index stores only tokens, names stay in bookings.
+            # Prefix indexes make 2- and 3-letter prefix queries a single lookup.
+            self.cursor.execute("""
+            CREATE VIRTUAL TABLE passenger_search USING fts5(
+                first_name_norm, last_name_norm, content = 'bookings', content_rowid = 'rowid',
+                prefix = '2 3', tokenize = 'unicode61 remove_diacritics 2'
+            );
+            """)
+        except sqlite3.OperationalError as e:
+            if "fts5" not in str(e):
+                raise
+            return False
+        self.cursor.executescript("""
+        CREATE TRIGGER bookings_search_insert AFTER INSERT ON bookings BEGIN
+            INSERT INTO passenger_search (rowid, first_name_norm, last_name_norm)
+            VALUES (new.rowid, new.first_name_norm, new.last_name_norm);
+        END;
+        CREATE TRIGGER bookings_search_delete AFTER DELETE ON bookings BEGIN
+            INSERT INTO passenger_search (passenger_search, rowid, first_name_norm, last_name_norm)
+            VALUES ('delete', old.rowid, old.first_name_norm, old.last_name_norm);
+        END;
+        CREATE TRIGGER bookings_search_update AFTER UPDATE ON bookings BEGIN
+            INSERT INTO passenger_search (passenger_search, rowid, first_name_norm, last_name_norm)
+            VALUES ('delete', old.rowid, old.first_name_norm, old.last_name_norm);
+            INSERT INTO passenger_search (rowid, first_name_norm, last_name_norm)
+            VALUES (new.rowid, new.first_name_norm, new.last_name_norm);
+        END;
+        """)
+        self.rebuild_search_index()
+        return True
+
+    def rebuild_search_index(self):
+        """
+        Re-read every booking into the FTS5 index. Needed after VACUUM, which may
+        renumber the bookings rowids the index refers to.
         """
-        self.cursor.execute(query)
-        self.conn.commit()
+        if self.cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'passenger_search';").fetchone():
+            with self.transaction():
+                self.cursor.execute(
+                    "INSERT INTO passenger_search (passenger_search) VALUES ('rebuild');")
+
+    def _log_events(self, events):
+        """
+        Append (flight_number, seat_id, status, booking_ref, passport_num, first_name,
+        last_name) events to booking_events; events for seats that do not exist are skipped.
+        Call inside the transaction that makes the change.
+        """
+        ts = time.time()
+        self.cursor.executemany("""
+        INSERT INTO booking_events
+        (ts, flight_number, seat_id, status, booking_ref, passport_num, first_name, last_name)
+        SELECT ?, flight_number, seat_id, ?, ?, ?, ?, ? FROM seats
+        WHERE flight_number = ? AND seat_id = ?;
+        """, ((ts, status, booking_ref, passport_num, first_name, last_name, flight_number, seat_id)
+              for flight_number, seat_id, status, booking_ref, passport_num, first_name, last_name
+              in events))
+
+    def _migrate_legacy_seat_bookings(self):
+        """Move the rows of a pre-flights `seat_bookings` table under DEFAULT_FLIGHT."""
+        with self.transaction():
+            self.cursor.execute("INSERT OR IGNORE INTO flights (flight_number) VALUES (?);",
+                                (DEFAULT_FLIGHT,))
+            self.cursor.execute("""
+            INSERT OR IGNORE INTO seats (flight_number, seat_id, seat_row, seat_col, status)
+            SELECT ?, seat_id, seat_row, seat_col, COALESCE(status, 'free') FROM seat_bookings;
+            """, (DEFAULT_FLIGHT,))
+            self.cursor.execute("""
+            INSERT OR IGNORE INTO bookings
+            (booking_ref, flight_number, seat_id, passport_num, first_name, last_name)
+            SELECT booking_ref, ?, seat_id, passport_num, first_name, last_name
+            FROM seat_bookings WHERE booking_ref IS NOT NULL;
+            """, (DEFAULT_FLIGHT,))
+            self.cursor.execute("DROP TABLE seat_bookings;")
+
+    def add_flight(self, flight_number):
+        self.cursor.execute("INSERT OR IGNORE INTO flights (flight_number) VALUES (?);",
+                            (flight_number,))
+        self._commit()
 
-    def insert_seat(self, seat_id, seat_row, seat_col):
+    def get_flights(self):
+        self.cursor.execute("SELECT flight_number FROM flights ORDER BY flight_number;")
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def insert_seat(self, seat_id, seat_row, seat_col, flight_number=DEFAULT_FLIGHT):
+        self.insert_seats([(seat_id, seat_row, seat_col)], flight_number)
+
+    def insert_seats(self, seats, flight_number=DEFAULT_FLIGHT):
+        """
+        Insert many (seat_id, seat_row, seat_col) tuples with a single commit.
+        Seats that already exist are left untouched.
+        """
         query = """
-        INSERT OR IGNORE INTO seat_bookings 
-        (seat_id, seat_row, seat_col, booking_ref, passport_num, first_name, last_name, status)
-        VALUES (?, ?, ?, NULL, NULL, NULL, NULL, 'free');
+        INSERT OR IGNORE INTO seats (flight_number, seat_id, seat_row, seat_col, status)
+        VALUES (?, ?, ?, ?, 'free');
+        """
+        with self.transaction():
+            self.cursor.execute("INSERT OR IGNORE INTO flights (flight_number) VALUES (?);",
+                                (flight_number,))
+            self.cursor.executemany(
+                query,
+                ((flight_number, seat_id, seat_row, seat_col) for seat_id, seat_row, seat_col in seats))
+        # New seats start free; the next find_best_seats rebuilds the flight's allocator
+        self._allocators.pop(flight_number, None)
+
+    def seed_seats(self, seats, flight_number, layout_key):
+        """
+        Make a flight's seats match a layout unless the flight was already seeded from
+        the same layout (layout_key, e.g. AircraftLayout.key), so a relaunch costs one
+        lookup instead of a pass over every seat. Seats missing from the database are
+        inserted and free seats that are not in the layout are deleted; if any seat not in
+        the layout is booked or held, ValueError is raised and nothing changes.
+        Returns True if the seats were changed.
         """
-        self.cursor.execute(query, (seat_id, seat_row, seat_col))
-        self.conn.commit()
+        self.cursor.execute("SELECT layout_key FROM flights WHERE flight_number = ?;",
+                            (flight_number,))
+        row = self.cursor.fetchone()
+        if row is not None and row[0] == layout_key:
+            return False
+        seats = list(seats)
+        with self.transaction():
+            removed = []
+            if row is not None:
+                # Reseeding with another layout: only reached when the layout changes
+                seat_ids = {seat[0] for seat in seats}
+                self.cursor.execute("SELECT seat_id, status FROM seats WHERE flight_number = ?;",
+                                    (flight_number,))
+                removed = [(seat_id, status) for seat_id, status in self.cursor.fetchall()
+                           if seat_id not in seat_ids]
+                occupied = sorted(seat_id for seat_id, status in removed if status != "free")
+                if occupied:
+                    raise ValueError(
+                        f"flight {flight_number} has {len(occupied)} booked or held seat(s) "
+                        f"not in the new layout: {', '.join(occupied[:10])}")
+                self.cursor.executemany(
+                    "DELETE FROM seats WHERE flight_number = ? AND seat_id = ? AND status = 'free';",
+                    ((flight_number, seat_id) for seat_id, _ in removed))
+            self.insert_seats(seats, flight_number)
+            self.cursor.execute("UPDATE flights SET layout_key = ? WHERE flight_number = ?;",
+                                (layout_key, flight_number))
+        return True
 
-    def get_seat_status(self, seat_id):
-        query = "SELECT status FROM seat_bookings WHERE seat_id = ?;"
-        self.cursor.execute(query, (seat_id,))
+    def get_seat_status(self, seat_id, flight_number=DEFAULT_FLIGHT):
+        query = "SELECT status FROM seats WHERE flight_number = ? AND seat_id = ?;"
+        self.cursor.execute(query, (flight_number, seat_id))
         result = self.cursor.fetchone()
         if result:
             return result[0]
         return None
 
-    def update_seat_booking(self, seat_id, booking_ref, passport_num, first_name, last_name, status):
+    def update_seat_booking(self, seat_id, booking_ref, passport_num, first_name, last_name, status,
+                            flight_number=DEFAULT_FLIGHT):
+        self.update_bookings([(seat_id, booking_ref, passport_num, first_name, last_name, status)],
+                             flight_number)
+
+    def update_bookings(self, bookings, flight_number=DEFAULT_FLIGHT):
+        """
+        Apply many (seat_id, booking_ref, passport_num, first_name, last_name, status)
+        tuples with a single commit. A None booking_ref clears the seat's booking.
+        """
+        bookings = [(seat_id, booking_ref, passport_num, first_name, last_name, status,
+                     normalize_name(first_name), normalize_name(last_name))
+                    for seat_id, booking_ref, passport_num, first_name, last_name, status in bookings]
+        with self.transaction():
+            self.cursor.executemany("""
+            UPDATE seats SET status = ?, held_until = NULL, hold_token = NULL
+            WHERE flight_number = ? AND seat_id = ?;
+            """,
+                ((booking[5], flight_number, booking[0]) for booking in bookings))
+            self.cursor.executemany(
+                "DELETE FROM bookings WHERE flight_number = ? AND seat_id = ?;",
+                ((flight_number, booking[0]) for booking in bookings))
+            # Only seats that exist get a booking row, matching the UPDATE above
+            self.cursor.executemany("""
+            INSERT INTO bookings
+            (booking_ref, flight_number, seat_id, passport_num, first_name, last_name,
+             first_name_norm, last_name_norm)
+            SELECT ?, flight_number, seat_id, ?, ?, ?, ?, ? FROM seats
+            WHERE flight_number = ? AND seat_id = ?;
+            """, ((booking_ref, passport_num, first_name, last_name, first_name_norm, last_name_norm,
+                   flight_number, seat_id)
+                  for seat_id, booking_ref, passport_num, first_name, last_name, _,
+                  first_name_norm, last_name_norm in bookings
+                  if booking_ref is not None))
+            self._add_name_terms(name for booking in bookings if booking[1] is not None
+                                 for name in booking[6:])
+            self._log_events(
+                (flight_number, seat_id, status, booking_ref, passport_num, first_name, last_name)
+                for seat_id, booking_ref, passport_num, first_name, last_name, status, _, _
+                in bookings)
+            for booking in bookings:
+                self._emit(flight_number, booking[0], booking[5])
+
+    def book_seat_atomic(self, seat_id, passport_num=None, first_name=None, last_name=None,
+                         flight_number=DEFAULT_FLIGHT, hold_token=None):
+        """
+        Book a seat only if it is currently free, as a single conditional UPDATE so two
+        agents on the same database can never both book it. A held seat can be booked with
+        the token returned by hold_seat_atomic, or by anyone once the hold has expired.
+        Returns (outcome, booking_ref); booking_ref is None unless outcome is OUTCOME_OK.
+        """
+        def attempt():
+            now = time.time()
+            with self.transaction():
+                self._log_expired_hold(seat_id, flight_number, now, hold_token)
+                self.cursor.execute("""
+                UPDATE seats SET status = 'booked', held_until = NULL, hold_token = NULL
+                WHERE flight_number = ? AND seat_id = ?
+                AND (status = 'free'
+                     OR (status = 'held' AND (hold_token = ? OR held_until <= ?)));
+                """, (flight_number, seat_id, hold_token, now))
+                if self.cursor.rowcount == 0:
+                    return self._missing_or_unavailable(seat_id, flight_number), None
+                booking_ref = self._insert_booking(seat_id, passport_num, first_name, last_name,
+                                                   flight_number)
+                self._log_events([(flight_number, seat_id, "booked", booking_ref, passport_num,
+                                   first_name, last_name)])
+                self._emit(flight_number, seat_id, "booked")
+            return OUTCOME_OK, booking_ref
+        return self._retry_busy(attempt)
+
+    def hold_seat_atomic(self, seat_id, ttl=HOLD_TTL_SECONDS, flight_number=DEFAULT_FLIGHT):
+        """
+        Hold a free seat, or one whose hold has expired, for `ttl` seconds while passenger
+        details are collected.
+        Returns (outcome, hold_token); pass the token to book_seat_atomic or release_hold.
+        """
+        hold_token = secrets.token_hex(8)
+
+        def attempt():
+            now = time.time()
+            with self.transaction():
+                self._log_expired_hold(seat_id, flight_number, now)
+                self.cursor.execute("""
+                UPDATE seats SET status = 'held', held_until = ?, hold_token = ?
+                WHERE flight_number = ? AND seat_id = ?
+                AND (status = 'free' OR (status = 'held' AND held_until <= ?));
+                """, (now + ttl, hold_token, flight_number, seat_id, now))
+                if self.cursor.rowcount == 0:
+                    return self._missing_or_unavailable(seat_id, flight_number), None
+                self._log_events([(flight_number, seat_id, "held", None, None, None, None)])
+                self._emit(flight_number, seat_id, "held")
+            return OUTCOME_OK, hold_token
+        return self._retry_busy(attempt)
+
+    def _log_expired_hold(self, seat_id, flight_number, now, hold_token=None):
+        """
+        Log the 'free' event implied when a seat whose hold has expired (and is not
+        `hold_token`'s) is taken over, as release_expired_holds would have. Call first in
+        the transaction: being a write, it takes the write lock, so the UPDATE that
+        follows sees the same row.
+        """
+        self.cursor.execute("""
+        INSERT INTO booking_events (ts, flight_number, seat_id, status)
+        SELECT ?, flight_number, seat_id, 'free' FROM seats
+        WHERE flight_number = ? AND seat_id = ? AND status = 'held' AND held_until <= ?
+        AND hold_token IS NOT ?;
+        """, (now, flight_number, seat_id, now, hold_token))
+
+    def release_hold(self, seat_id, hold_token, flight_number=DEFAULT_FLIGHT):
+        """Give a held seat back before its hold expires. Returns the outcome."""
+        def attempt():
+            with self.transaction():
+                self.cursor.execute("""
+                UPDATE seats SET status = 'free', held_until = NULL, hold_token = NULL
+                WHERE flight_number = ? AND seat_id = ? AND status = 'held' AND hold_token = ?;
+                """, (flight_number, seat_id, hold_token))
+                if self.cursor.rowcount == 0:
+                    return self._missing_or_unavailable(seat_id, flight_number)
+                self._log_events([(flight_number, seat_id, "free", None, None, None, None)])
+                self._emit(flight_number, seat_id, "free")
+            return OUTCOME_OK
+        return self._retry_busy(attempt)
+
+    def release_expired_holds(self, now=None):
+        """
+        Free every seat whose hold has expired, with one UPDATE over the held_until index.
+        Returns the number of seats released.
+        """
+        now = time.time() if now is None else now
+
+        def attempt():
+            with self.transaction():
+                self.cursor.execute("""
+                INSERT INTO booking_events (ts, flight_number, seat_id, status)
+                SELECT ?, flight_number, seat_id, 'free' FROM seats WHERE held_until <= ?;
+                """, (time.time(), now))
+                if self._listeners or self._allocators:
+                    self.cursor.execute(
+                        "SELECT flight_number, seat_id FROM seats WHERE held_until <= ?;", (now,))
+                    for flight_number, seat_id in self.cursor.fetchall():
+                        self._emit(flight_number, seat_id, "free")
+                self.cursor.execute("""
+                UPDATE seats SET status = 'free', held_until = NULL, hold_token = NULL
+                WHERE held_until <= ?;
+                """, (now,))
+                return self.cursor.rowcount
+        return self._retry_busy(attempt)
+
+    def next_hold_expiry(self):
+        """Earliest held_until of any active hold (an index lookup), or None."""
+        self.cursor.execute("SELECT MIN(held_until) FROM seats WHERE held_until IS NOT NULL;")
+        return self.cursor.fetchone()[0]
+
+    def _insert_booking(self, seat_id, passport_num, first_name, last_name, flight_number):
+        """
+        Insert a booking row under a freshly allocated reference. Allocated references are
+        unique, but databases created before the allocator may hold random ones, so a
+        UNIQUE violation on booking_ref just moves on to the next reference.
+        """
+        first_name_norm, last_name_norm = normalize_name(first_name), normalize_name(last_name)
+        while True:
+            booking_ref = generate_unique_booking_ref(self)
+            try:
+                self.cursor.execute("""
+                INSERT INTO bookings
+                (booking_ref, flight_number, seat_id, passport_num, first_name, last_name,
+                 first_name_norm, last_name_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?);
+                """, (booking_ref, flight_number, seat_id, passport_num, first_name, last_name,
+                      first_name_norm, last_name_norm))
+                self._add_name_terms((first_name_norm, last_name_norm))
+                return booking_ref
+            except sqlite3.IntegrityError as e:
+                if "booking_ref" not in str(e):
+                    raise
+
+    def free_seat_atomic(self, seat_id, flight_number=DEFAULT_FLIGHT):
+        """
+        Free a seat only if it is currently booked. Returns the outcome.
+        """
+        def attempt():
+            with self.transaction():
+                self.cursor.execute("""
+                UPDATE seats SET status = 'free'
+                WHERE flight_number = ? AND seat_id = ? AND status = 'booked';
+                """, (flight_number, seat_id))
+                if self.cursor.rowcount == 0:
+                    return self._missing_or_unavailable(seat_id, flight_number)
+                self.cursor.execute("DELETE FROM bookings WHERE flight_number = ? AND seat_id = ?;",
+                                    (flight_number, seat_id))
+                self._log_events([(flight_number, seat_id, "free", None, None, None, None)])
+                self._emit(flight_number, seat_id, "free")
+            return OUTCOME_OK
+        return self._retry_busy(attempt)
+
+    def _missing_or_unavailable(self, seat_id, flight_number):
+        if self.get_seat_status(seat_id, flight_number) is None:
+            return OUTCOME_NOT_FOUND
+        return OUTCOME_UNAVAILABLE
+
+    def get_all_seats(self, flight_number=DEFAULT_FLIGHT):
+        query = "SELECT seat_id, status FROM seats WHERE flight_number = ? ORDER BY seat_row, seat_col;"
+        self.cursor.execute(query, (flight_number,))
+        return self.cursor.fetchall()
+
+    def iter_seat_bookings(self, flight_number=None, booked_only=False, chunk_size=5000):
+        """
+        Stream (flight_number, seat_id, seat_row, seat_col, status, booking_ref, passport_num,
+        first_name, last_name) rows in primary-key order, fetching chunk_size rows at a time
+        on a private cursor, so memory stays constant however many rows there are.
+        """
         query = """
-        UPDATE seat_bookings
-        SET booking_ref = ?, passport_num = ?, first_name = ?, last_name = ?, status = ?
-        WHERE seat_id = ?;
+        SELECT s.flight_number, s.seat_id, s.seat_row, s.seat_col, s.status,
+               b.booking_ref, b.passport_num, b.first_name, b.last_name
+        FROM seats s
+        LEFT JOIN bookings b ON b.flight_number = s.flight_number AND b.seat_id = s.seat_id
         """
-        self.cursor.execute(query, (booking_ref, passport_num, first_name, last_name, status, seat_id))
-        self.conn.commit()
+        conditions, params = [], []
+        if flight_number is not None:
+            conditions.append("s.flight_number = ?")
+            params.append(flight_number)
+        if booked_only:
+            conditions.append("s.status = 'booked'")
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY s.flight_number, s.seat_id;"
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
 
-    def get_all_seats(self):
-        query = "SELECT seat_id, status FROM seat_bookings;"
-        self.cursor.execute(query)
+    def seat_history(self, seat_id, flight_number=DEFAULT_FLIGHT):
+        """
+        Every recorded change of a seat, oldest first, as (ts, status, booking_ref,
+        passport_num, first_name, last_name) rows.
+        """
+        self.cursor.execute("""
+        SELECT ts, status, booking_ref, passport_num, first_name, last_name
+        FROM booking_events WHERE flight_number = ? AND seat_id = ? ORDER BY ts, id;
+        """, (flight_number, seat_id))
+        return self.cursor.fetchall()
+
+    def get_seats_as_of(self, timestamp, flight_number=DEFAULT_FLIGHT):
+        """
+        (seat_id, status) of every seat as it was at `timestamp` (seconds since the epoch),
+        in cabin order. Each seat's status is its latest event at or before then, found with
+        one seek on idx_booking_events_seat, so the cost does not grow with the log.
+        Seats with no event by then were free.
+        """
+        self.cursor.execute("""
+        SELECT s.seat_id, COALESCE((
+            SELECT e.status FROM booking_events e
+            WHERE e.flight_number = s.flight_number AND e.seat_id = s.seat_id AND e.ts <= ?
+            ORDER BY e.ts DESC, e.id DESC LIMIT 1), 'free')
+        FROM seats s WHERE s.flight_number = ? ORDER BY s.seat_row, s.seat_col;
+        """, (timestamp, flight_number))
+        return self.cursor.fetchall()
+
+    def iter_events(self, flight_number=None, since=None, until=None, chunk_size=5000):
+        """
+        Stream (id, ts, flight_number, seat_id, status, booking_ref, passport_num,
+        first_name, last_name) events in the order they were written, optionally limited
+        to one flight and/or the time range since <= ts < until.
+        """
+        query = "SELECT * FROM booking_events"
+        conditions, params = [], []
+        if flight_number is not None:
+            conditions.append("flight_number = ?")
+            params.append(flight_number)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id;"
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def last_event_id(self):
+        """Id of the newest booking_events row (0 if there is none)."""
+        self.cursor.execute("SELECT MAX(id) FROM booking_events;")
+        return self.cursor.fetchone()[0] or 0
+
+    def seat_changes_since(self, event_id):
+        """
+        (id, flight_number, seat_id, status) of every event after event_id, oldest first:
+        a range scan of the log's primary key, so it costs only the changes themselves.
+        """
+        self.cursor.execute("""
+        SELECT id, flight_number, seat_id, status FROM booking_events WHERE id > ? ORDER BY id;
+        """, (event_id,))
+        return self.cursor.fetchall()
+
+    def get_layout_key(self, flight_number=DEFAULT_FLIGHT):
+        """layout_key the flight was seeded from (see seed_seats), or None."""
+        self.cursor.execute("SELECT layout_key FROM flights WHERE flight_number = ?;",
+                            (flight_number,))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def count_by_status(self, flight_number=DEFAULT_FLIGHT):
+        query = "SELECT status, COUNT(*) FROM seats WHERE flight_number = ? GROUP BY status;"
+        self.cursor.execute(query, (flight_number,))
+        return dict(self.cursor.fetchall())
+
+    def count_by_row(self, flight_number=DEFAULT_FLIGHT):
+        """Returns (seat_row, status, count) tuples in row order."""
+        query = """
+        SELECT seat_row, status, COUNT(*) FROM seats WHERE flight_number = ?
+        GROUP BY seat_row, status ORDER BY seat_row;
+        """
+        self.cursor.execute(query, (flight_number,))
+        return self.cursor.fetchall()
+
+    def page_seats(self, flight_number=DEFAULT_FLIGHT, after=None, limit=100):
+        """
+        One page of a flight's seats in cabin order, with booking details:
+        (seat_row, seat_col, seat_id, status, booking_ref, first_name, last_name) tuples.
+        `after` is the (seat_row, seat_col) of the last row of the previous page; paging by
+        key rather than OFFSET keeps every page an index seek.
+        """
+        seat_row, seat_col = after or (0, "")
+        query = """
+        SELECT s.seat_row, s.seat_col, s.seat_id, s.status, b.booking_ref, b.first_name, b.last_name
+        FROM seats s
+        LEFT JOIN bookings b ON b.flight_number = s.flight_number AND b.seat_id = s.seat_id
+        WHERE s.flight_number = ? AND (s.seat_row, s.seat_col) > (?, ?)
+        ORDER BY s.seat_row, s.seat_col
+        LIMIT ?;
+        """
+        self.cursor.execute(query, (flight_number, seat_row, seat_col, limit))
+        return self.cursor.fetchall()
+
+    def iter_seat_pages(self, flight_number=DEFAULT_FLIGHT, page_size=100):
+        """Yield successive page_seats() pages until the flight is exhausted."""
+        after = None
+        while True:
+            page = self.page_seats(flight_number, after, page_size)
+            if not page:
+                return
+            yield page
+            after = page[-1][:2]
+
+    def page_occupancy(self, after=None, limit=100):
+        """
+        One page of per-flight occupancy in flight_number order:
+        (flight_number, total, booked, free) tuples, starting after flight `after`.
+        """
+        query = """
+        SELECT flight_number, COUNT(*), SUM(status = 'booked'), SUM(status = 'free')
+        FROM seats WHERE flight_number > ?
+        GROUP BY flight_number ORDER BY flight_number
+        LIMIT ?;
+        """
+        self.cursor.execute(query, (after or "", limit))
         return self.cursor.fetchall()
 
+    def get_free_seats(self, flight_number=DEFAULT_FLIGHT):
+        query = "SELECT seat_id FROM seats WHERE flight_number = ? AND status = 'free';"
+        self.cursor.execute(query, (flight_number,))
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def find_best_seats(self, n, preferences=None, flight_number=DEFAULT_FLIGHT, layout=None):
+        """
+        Returns ids of n free seats on a flight, adjacent in a row where possible.
+        The aisle split of each row comes from `layout` (an AircraftLayout), by default the
+        layout the flight was seeded from (see seed_seats); a flight with neither raises
+        ValueError. See SeatAllocator for `preferences`.
+        The seats are not booked; book them with book_seat_atomic.
+        """
+        return self._allocator(flight_number, layout).find(n, preferences)
+
+    def _allocator(self, flight_number, layout):
+        """
+        The flight's SeatAllocator. It is built from the seats table once, then updated
+        from this manager's seat changes as they commit, and from the event log when
+        another connection has committed (PRAGMA data_version moved).
+        """
+        data_version = self.conn.execute("PRAGMA data_version;").fetchone()[0]
+        if data_version != self._allocator_data_version:
+            self._allocator_data_version = data_version
+            if self._allocators:
+                changes = self.seat_changes_since(self._allocator_event_id)
+                for _, changed_flight, seat_id, status in changes:
+                    entry = self._allocators.get(changed_flight)
+                    if entry is not None:
+                        entry[1].set_free(seat_id, status == "free")
+                if changes:
+                    self._allocator_event_id = changes[-1][0]
+            else:
+                self._allocator_event_id = self.last_event_id()
+
+        layout_key = layout.key if layout is not None else self.get_layout_key(flight_number)
+        entry = self._allocators.get(flight_number)
+        if entry is not None and entry[0] == layout_key:
+            return entry[1]
+        if layout is None:
+            if layout_key is None:
+                raise ValueError(f"flight {flight_number} has no stored layout; pass layout=")
+            from aircraft_layout import layout_from_key
+            layout = layout_from_key(layout_key)
+        self.cursor.execute("SELECT seat_id FROM seats WHERE flight_number = ? AND status = 'free';",
+                            (flight_number,))
+        allocator = SeatAllocator(rows_from_layout(layout), (row[0] for row in self.cursor))
+        self._allocators[flight_number] = (layout_key, allocator)
+        return allocator
+
+    def find_booking_refs(self, booking_refs):
+        """Map each of booking_refs that is in use to its (flight_number, seat_id)."""
+        booking_refs = list(booking_refs)
+        owners = {}
+        # Batched to stay under SQLite's limit on bound parameters
+        for start in range(0, len(booking_refs), 500):
+            batch = booking_refs[start:start + 500]
+            self.cursor.execute(f"""
+            SELECT booking_ref, flight_number, seat_id FROM bookings
+            WHERE booking_ref IN ({", ".join("?" * len(batch))});
+            """, batch)
+            owners.update((ref, (flight_number, seat_id))
+                          for ref, flight_number, seat_id in self.cursor.fetchall())
+        return owners
+
+    def find_bookings_by_passport(self, passport_num):
+        query = """
+        SELECT flight_number, seat_id, booking_ref FROM bookings WHERE passport_num = ?;
+        """
+        self.cursor.execute(query, (passport_num,))
+        return self.cursor.fetchall()
+
+    def find_bookings_by_name(self, last_name, first_name=None):
+        """
+        Bookings whose last name (and first name, if given) equal these, ignoring case,
+        accents and extra spaces. Rows are (booking_ref, flight_number, seat_id,
+        passport_num, first_name, last_name).
+        """
+        query = f"SELECT {PASSENGER_COLUMNS} FROM bookings WHERE last_name_norm = ?"
+        params = [normalize_name(last_name)]
+        if first_name is not None:
+            query += " AND first_name_norm = ?"
+            params.append(normalize_name(first_name))
+        self.cursor.execute(query + ";", params)
+        return self.cursor.fetchall()
+
+    def search_passengers(self, text, limit=20, fuzzy=True):
+        """
+        Find bookings as the user types. An exact booking reference finds its booking;
+        other text with a digit is matched against passport number prefixes, the rest
+        against name prefixes, every word having to start a first or last name ("jo smi"
+        finds John Smith). If nothing matches and fuzzy is set, misspelt words are replaced
+        with the closest indexed names ("jonh" finds John). Rows are as in
+        find_bookings_by_name.
+        """
+        text = " ".join(text.split())
+        if not text:
+            return []
+        if len(text) == REF_LENGTH:
+            self.cursor.execute(f"SELECT {PASSENGER_COLUMNS} FROM bookings WHERE booking_ref = ?;",
+                                (text,))
+            rows = self.cursor.fetchall()
+            if rows:
+                return rows
+        if any(ch.isdigit() for ch in text):
+            self.cursor.execute(f"""
+            SELECT {PASSENGER_COLUMNS} FROM bookings
+            WHERE passport_num >= ? AND passport_num < ? LIMIT ?;
+            """, (text, text + PREFIX_END, limit))
+            return self.cursor.fetchall()
+        words = (normalize_name(text) or "").replace(",", " ").split()
+        if not words:
+            return []
+        if not self.has_search_index:
+            rows = self._search_names_by_prefix(words, limit)
+            if not rows and fuzzy:
+                rows = self._search_names_by_prefix(
+                    [(self._close_terms(word) or [word])[0] for word in words], limit)
+            return rows
+        rows = self._match_names([[word] for word in words], True, limit)
+        if not rows and fuzzy:
+            rows = self._match_names([self._close_terms(word) or [word] for word in words],
+                                     False, limit)
+        return rows
+
+    def _match_names(self, alternatives, prefix, limit):
+        # One AND clause per word, each an OR of the accepted spellings
+        clauses = []
+        for words in alternatives:
+            terms = ['"' + word.replace('"', '""') + '"' + ("*" if prefix else "")
+                     for word in words]
+            clauses.append("(" + " OR ".join(terms) + ")")
+        self.cursor.execute(f"""
+        SELECT {PASSENGER_COLUMNS} FROM bookings
+        WHERE rowid IN (SELECT rowid FROM passenger_search WHERE passenger_search MATCH ? LIMIT ?);
+        """, (" AND ".join(clauses), limit))
+        return self.cursor.fetchall()
+
+    def _close_terms(self, word, n=5):
+        """
+        Indexed names closest to a misspelt word. Candidates are the names sharing its first
+        two letters, then its first letter (typos are rarest at the start of a word), so
+        only a small slice of the vocabulary is compared.
+        """
+        for prefix in dict.fromkeys((word[:2], word[:1])):
+            self.cursor.execute("""
+            SELECT term FROM passenger_terms WHERE term >= ? AND term < ?;
+            """, (prefix, prefix + PREFIX_END))
+            matches = difflib.get_close_matches(
+                word, [row[0] for row in self.cursor.fetchall()], n=n, cutoff=0.75)
+            if matches:
+                return matches
+        return []
+
+    def _search_names_by_prefix(self, words, limit):
+        """search_passengers without FTS5: prefix range scans on the normalized name indexes."""
+        first, rest = words[0], words[1:]
+        self.cursor.execute(f"""
+        SELECT {PASSENGER_COLUMNS}, first_name_norm, last_name_norm FROM bookings
+        WHERE last_name_norm >= ? AND last_name_norm < ?
+        UNION
+        SELECT {PASSENGER_COLUMNS}, first_name_norm, last_name_norm FROM bookings
+        WHERE first_name_norm >= ? AND first_name_norm < ?;
+        """, (first, first + PREFIX_END, first, first + PREFIX_END))
+        rows = []
+        for row in self.cursor:
+            names = f"{row[-2] or ''} {row[-1] or ''}".split()
+            if all(any(name.startswith(word) for name in names) for word in rest):
+                rows.append(row[:-2])
+                if len(rows) == limit:
+                    break
+        return rows
+
     def check_booking_ref_exists(self, booking_ref):
-        query = "SELECT 1 FROM seat_bookings WHERE booking_ref = ?;"
+        query = "SELECT 1 FROM bookings WHERE booking_ref = ?;"
         self.cursor.execute(query, (booking_ref,))
         return self.cursor.fetchone() is not None
 
     def close(self):
-        self.conn.close()
+        if self._conn is not None:
+            self._conn.close()
+
+
+class BookingRefAllocator:
+    """
+    Issues unique booking references without probing the bookings table.
+    Each allocator reserves a block of sequence numbers from `ref_sequence`, so any number
+    of processes can share a database file without overlap. Sequence numbers are scrambled
+    into the 8-character alphanumeric space so consecutive bookings do not get guessable
+    consecutive references.
+    """
+    def __init__(self, db_manager, block_size=1000):
+        self.db_manager = db_manager
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+
+    def next_ref(self):
+        if self._next >= self._end:
+            self._next, self._end = self._reserve_block()
+        value = self._next
+        self._next += 1
+        return encode_booking_ref(value)
+
+    def _reserve_block(self):
+        # Runs on the manager's own connection, so it joins any open transaction instead of
+        # waiting on that transaction's write lock; a rollback calls reset()
+        db = self.db_manager
+        with db.transaction():
+            db.cursor.execute("""
+            UPDATE ref_sequence SET next_value = next_value + ? WHERE name = 'booking_ref';
+            """, (self.block_size,))
+            (end,) = db.cursor.execute(
+                "SELECT next_value FROM ref_sequence WHERE name = 'booking_ref';").fetchone()
+        return end - self.block_size, end
+
+    def reset(self):
+        """Forget the current block; its reservation may have been rolled back."""
+        self._next = self._end = 0
+
+
+# Columns returned by the passenger lookups
+PASSENGER_COLUMNS = "booking_ref, flight_number, seat_id, passport_num, first_name, last_name"
+
+
+def normalize_name(name):
+    """Lower-case, accent-free, single-spaced form of a name, as indexed for lookups."""
+    if not name:
+        return None
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split()) or None
+
+
+def split_passenger_name(name):
+    """
+    Split a name as typed into (first_name, last_name): "Last, First" or
+    "First [Middle] Last". A single word is taken as the first name.
+    """
+    if not name or not name.strip():
+        return None, None
+    if "," in name:
+        last_name, first_name = name.split(",", 1)
+        return " ".join(first_name.split()) or None, " ".join(last_name.split()) or None
+    words = name.split()
+    if len(words) == 1:
+        return words[0], None
+    return " ".join(words[:-1]), words[-1]
+
+
+def encode_booking_ref(value):
+    """Map a sequence number to its 8-character booking reference (one-to-one)."""
+    value = (value * REF_MULTIPLIER + REF_OFFSET) % REF_SPACE
+    chars = []
+    for _ in range(REF_LENGTH):
+        value, digit = divmod(value, len(REF_ALPHABET))
+        chars.append(REF_ALPHABET[digit])
+    return "".join(chars)
 
 
 def generate_unique_booking_ref(db_manager):
-    while True:
-        ref = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-        if not db_manager.check_booking_ref_exists(ref):
-            return ref
\ No newline at end of file
+    return db_manager.ref_allocator.next_ref()
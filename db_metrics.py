@@ -0,0 +1,249 @@
+"""
+Optional performance instrumentation for DatabaseManager.
+
+    metrics = DatabaseMetrics()
+    metrics.attach(db_manager)      # any number of managers, e.g. one per thread
+    ...
+    metrics.snapshot()              # {method: {"calls", "p50_ms", "rows_changed", ...}}
+    metrics.start_logging(60)       # or one summary line every 60 s
+    metrics.detach(db_manager)
+
+attach() shadows the manager's public methods with timed wrappers on that instance only
+and installs the connection's trace and progress callbacks; detach() removes them all,
+so a manager that was never attached runs exactly the code it always did.
+"""
+import bisect
+import inspect
+import threading
+import time
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# SQLite virtual machine instructions between progress callbacks
+PROGRESS_STEPS = 1000
+
+# DatabaseManager methods that are not operations worth timing
+UNINSTRUMENTED = {"transaction", "add_listener", "remove_listener", "create_table", "close"}
+
+
+class LatencyHistogram:
+    """Counts of latencies per bucket of LATENCY_BUCKETS_MS."""
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (max latency for the last one)."""
+        if not self.total:
+            return None
+        rank = p / 100 * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self):
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.total,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+class MethodStats:
+    """Totals for one DatabaseManager method."""
+    __slots__ = ("latency", "errors", "total_ms", "rows_changed", "rows_returned",
+                 "statements", "vm_steps", "busy_retries", "busy_wait_ms")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.total_ms = 0.0
+        self.rows_changed = 0
+        self.rows_returned = 0
+        self.statements = 0
+        self.vm_steps = 0
+        self.busy_retries = 0
+        self.busy_wait_ms = 0.0
+
+    def snapshot(self):
+        latency = self.latency.snapshot()
+        return {
+            "calls": latency["count"],
+            "errors": self.errors,
+            "total_ms": round(self.total_ms, 3),
+            "p50_ms": latency["p50_ms"],
+            "p90_ms": latency["p90_ms"],
+            "p99_ms": latency["p99_ms"],
+            "max_ms": round(latency["max_ms"], 3),
+            "rows_changed": self.rows_changed,
+            "rows_returned": self.rows_returned,
+            "statements": self.statements,
+            "vm_steps": self.vm_steps,
+            "busy_retries": self.busy_retries,
+            "busy_wait_ms": round(self.busy_wait_ms, 3),
+        }
+
+
+class _ConnectionCounters:
+    """Fed by one connection's trace and progress callbacks."""
+    __slots__ = ("statements", "vm_steps")
+
+    def __init__(self):
+        self.statements = 0
+        self.vm_steps = 0
+
+    def on_statement(self, statement):
+        self.statements += 1
+
+    def on_progress(self):
+        self.vm_steps += PROGRESS_STEPS
+        return 0
+
+
+class DatabaseMetrics:
+    """
+    Per-method call counts, latency percentiles, rows changed (connection total_changes)
+    and returned, SQL statements run (trace callback, trigger statements included),
+    approximate VM steps (progress callback), and busy retries with the time they cost
+    (the attempt that timed out plus the backoff). Waiting for a lock that is obtained
+    within SQLite's busy timeout is not broken out; it shows up only as latency.
+
+    Figures are inclusive: a method that calls another public method is charged for
+    the inner call's work as well.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+        self._log_timer = None
+        self._log_interval = None
+        self._log = print
+
+    def attach(self, db_manager):
+        """Start recording db_manager's calls (connecting it if it has not yet)."""
+        conn = db_manager.conn
+        counters = _ConnectionCounters()
+        conn.set_trace_callback(counters.on_statement)
+        conn.set_progress_handler(counters.on_progress, PROGRESS_STEPS)
+        for name, function in vars(type(db_manager)).items():
+            if name.startswith("_") or name in UNINSTRUMENTED or not inspect.isfunction(function):
+                continue
+            setattr(db_manager, name, self._wrap(db_manager, counters, name, function))
+
+    def detach(self, db_manager):
+        """Stop recording db_manager; it goes back to its plain methods."""
+        for name, function in vars(type(db_manager)).items():
+            if name in vars(db_manager) and inspect.isfunction(function):
+                delattr(db_manager, name)
+        if db_manager._conn is not None:
+            db_manager._conn.set_trace_callback(None)
+            db_manager._conn.set_progress_handler(None, 0)
+
+    def _wrap(self, db_manager, counters, name, function):
+        method = function.__get__(db_manager)
+
+        def start():
+            return (time.perf_counter(), db_manager.conn.total_changes, counters.statements,
+                    counters.vm_steps, db_manager.busy_retry_count, db_manager.busy_wait_seconds)
+
+        def finish(before, rows_returned, error):
+            elapsed_ms = (time.perf_counter() - before[0]) * 1000
+            with self._lock:
+                stats = self._methods.get(name)
+                if stats is None:
+                    stats = self._methods[name] = MethodStats()
+                stats.latency.add(elapsed_ms)
+                stats.total_ms += elapsed_ms
+                stats.errors += error
+                stats.rows_changed += db_manager.conn.total_changes - before[1]
+                stats.rows_returned += rows_returned
+                stats.statements += counters.statements - before[2]
+                stats.vm_steps += counters.vm_steps - before[3]
+                stats.busy_retries += db_manager.busy_retry_count - before[4]
+                stats.busy_wait_ms += (db_manager.busy_wait_seconds - before[5]) * 1000
+
+        if inspect.isgeneratorfunction(function):
+            # Streaming reads are timed from the call until the caller stops iterating;
+            # stopping early (break, islice, close()) is not an error
+            def wrapper(*args, **kwargs):
+                before = start()
+                rows, error = 0, True
+                try:
+                    for row in method(*args, **kwargs):
+                        rows += 1
+                        yield row
+                    error = False
+                except GeneratorExit:
+                    error = False
+                    raise
+                finally:
+                    finish(before, rows, error)
+        else:
+            def wrapper(*args, **kwargs):
+                before = start()
+                try:
+                    result = method(*args, **kwargs)
+                except BaseException:
+                    finish(before, 0, True)
+                    raise
+                finish(before, len(result) if isinstance(result, list) else 0, False)
+                return result
+        wrapper.__name__ = name
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def snapshot(self):
+        """{method_name: stats dict} for every method called since attach() or reset()."""
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in sorted(self._methods.items())}
+
+    def reset(self):
+        with self._lock:
+            self._methods = {}
+
+    def format_line(self, top=5):
+        """One-line summary of the methods with the most total time."""
+        snapshot = self.snapshot()
+        busiest = sorted(snapshot.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        parts = [f"{name} {stats['calls']}x p50<={stats['p50_ms']}ms p99<={stats['p99_ms']}ms "
+                 f"rows {stats['rows_changed']}/{stats['rows_returned']}"
+                 + (f" busy {stats['busy_retries']}" if stats["busy_retries"] else "")
+                 for name, stats in busiest[:top]]
+        return "db: " + ("; ".join(parts) if parts else "no calls")
+
+    def start_logging(self, interval, log=print):
+        """Call log(format_line()) every `interval` seconds, on a timer thread."""
+        self.stop_logging()
+        self._log_interval = interval
+        self._log = log
+        self._schedule_log()
+
+    def _schedule_log(self):
+        self._log_timer = threading.Timer(self._log_interval, self._log_tick)
+        self._log_timer.daemon = True
+        self._log_timer.start()
+
+    def _log_tick(self):
+        if self._log_interval is None:
+            return
+        self._log(self.format_line())
+        self._schedule_log()
+
+    def stop_logging(self):
+        self._log_interval = None
+        if self._log_timer is not None:
+            self._log_timer.cancel()
+            self._log_timer = None
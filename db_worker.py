@@ -0,0 +1,134 @@
+import itertools
+import queue
+import threading
+import time
+
+from database_manager import DatabaseManager
+from db_metrics import LatencyHistogram
+
+# How often the Tk side collects finished jobs (milliseconds)
+RESULT_POLL_MS = 20
+
+
+class Job:
+    """A queued database operation. cancel() drops it as long as it has not started."""
+    _ids = itertools.count(1)
+
+    def __init__(self, op_name, method_name, args, callback, errback):
+        self.id = next(self._ids)
+        self.op_name = op_name
+        self.method_name = method_name
+        self.args = args
+        self.callback = callback
+        self.errback = errback
+        self.cancelled = False
+        self.started = False
+        self.submitted = time.perf_counter()
+        # Taken by cancel() and start() so a job is either cancelled or run, never both
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Returns True if this call cancelled the job, False if it had already started."""
+        with self._lock:
+            if self.started or self.cancelled:
+                return False
+            self.cancelled = True
+            return True
+
+    def start(self):
+        """Called by the worker thread; returns False if the job was cancelled first."""
+        with self._lock:
+            if not self.cancelled:
+                self.started = True
+            return self.started
+
+
+class DatabaseWorker:
+    """
+    Runs DatabaseManager calls on a background thread with its own SQLite connection,
+    so a slow or locked database file never blocks the Tk main loop.
+
+    Jobs are executed in submission order. Results are handed back to the Tk thread,
+    which collects them every RESULT_POLL_MS via master.after and calls the job's
+    callback(result) or errback(exception) there. Latency (queue wait plus execution)
+    is recorded per operation name.
+    """
+    def __init__(self, master, db_name, **db_kwargs):
+        self.master = master
+        self.db_name = db_name
+        self.db_kwargs = db_kwargs
+        self.histograms = {}
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = {}
+        self._thread = threading.Thread(target=self._run, name="db-worker", daemon=True)
+        self._thread.start()
+        self._poll_id = self.master.after(RESULT_POLL_MS, self._drain_results)
+
+    def submit(self, op_name, method_name, args=(), callback=None, errback=None):
+        """Queue db_manager.<method_name>(*args); returns the Job."""
+        job = Job(op_name, method_name, args, callback, errback)
+        self._pending[job.id] = job
+        self._jobs.put(job)
+        return job
+
+    def cancel_all(self):
+        """
+        Cancel every job that has not started; returns how many were cancelled. Jobs
+        already running or finished still report their result.
+        """
+        return sum(job.cancel() for job in list(self._pending.values()))
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def stop(self):
+        """Cancel outstanding jobs and close the worker's connection."""
+        self.cancel_all()
+        self._jobs.put(None)
+        self._thread.join(timeout=5)
+        if self._poll_id is not None:
+            self.master.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def latency_snapshot(self):
+        return {op_name: histogram.snapshot() for op_name, histogram in self.histograms.items()}
+
+    def _run(self):
+        db_manager = DatabaseManager(self.db_name, **self.db_kwargs)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                if not job.start():
+                    self._results.put((job, None, None, None))
+                    continue
+                try:
+                    result, error = getattr(db_manager, job.method_name)(*job.args), None
+                except Exception as e:
+                    result, error = None, e
+                elapsed_ms = (time.perf_counter() - job.submitted) * 1000
+                self._results.put((job, result, error, elapsed_ms))
+        finally:
+            db_manager.close()
+
+    def _drain_results(self):
+        # Reschedule first so an exception raised from a callback does not stop the polling
+        self._poll_id = self.master.after(RESULT_POLL_MS, self._drain_results)
+        while True:
+            try:
+                job, result, error, elapsed_ms = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.pop(job.id, None)
+            if elapsed_ms is not None:
+                self.histograms.setdefault(job.op_name, LatencyHistogram()).add(elapsed_ms)
+            if job.cancelled:
+                continue
+            if error is not None:
+                if job.errback is None:
+                    raise error
+                job.errback(error)
+            elif job.callback is not None:
+                job.callback(result)
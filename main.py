@@ -1,9 +1,13 @@
+import sys
 import tkinter as tk
-from booking_systemgui import *
+from aircraft_layout import DEFAULT_LAYOUT_PATH
+from booking_systemgui import BookingSystemGUI
 
 def main():
+    # Optional argument: path to an aircraft layout config (.json or .toml)
+    layout_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LAYOUT_PATH
     root = tk.Tk()
-    app = BookingSystemGUI(root)
+    app = BookingSystemGUI(root, layout_path=layout_path)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -2,6 +2,10 @@ import tkinter as tk
 from tkinter import messagebox
 from flight import Flight
 
+# Button colors (background, foreground) per seat status
+SEAT_COLORS = {"free": ("green", "black"), "booked": ("red", "white")}
+UNKNOWN_SEAT_COLORS = ("gray", "white")
+
 class BookingSystemGUI:
     """
     Main GUI class using Tkinter.
@@ -17,8 +21,11 @@ class BookingSystemGUI:
         self._build_left_panel()
         self._build_seat_map()
 
-        # Initial update to color-code the seat map.
+        # Initial update to color-code the seat map; afterwards only changed seats are repainted.
         self.update_seat_map()
+        self._pending_seat_changes = {}
+        self._flush_scheduled = False
+        self.flight.add_listener(self._on_seat_changed)
 
     def _build_left_panel(self):
         """
@@ -114,14 +121,31 @@ class BookingSystemGUI:
           - Green indicates a free seat.
           - Red indicates a booked seat.
         """
+        all_seats_status = self.flight.get_all_seats_status()
         for seat_id, btn in self.seat_buttons.items():
-            status = self.flight.get_all_seats_status().get(seat_id)
-            if status == "free":
-                btn.config(bg="green", fg="black")
-            elif status == "booked":
-                btn.config(bg="red", fg="white")
-            else:
-                btn.config(bg="gray", fg="white")
+            self._paint_seat(btn, all_seats_status.get(seat_id))
+
+    def _paint_seat(self, btn, status):
+        bg, fg = SEAT_COLORS.get(status, UNKNOWN_SEAT_COLORS)
+        btn.config(bg=bg, fg=fg)
+
+    def _on_seat_changed(self, seat_id, status):
+        """
+        Flight listener: remember the seat's new status and repaint every remembered
+        seat in one after_idle pass, however many bookings arrive before then.
+        """
+        self._pending_seat_changes[seat_id] = status
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.master.after_idle(self._flush_seat_changes)
+
+    def _flush_seat_changes(self):
+        changes, self._pending_seat_changes = self._pending_seat_changes, {}
+        self._flush_scheduled = False
+        for seat_id, status in changes.items():
+            btn = self.seat_buttons.get(seat_id)
+            if btn is not None:
+                self._paint_seat(btn, status)
 
     def check_seat(self):
         seat_id = self.seat_entry.get().strip()
@@ -150,7 +174,6 @@ class BookingSystemGUI:
             messagebox.showinfo("Success", f"Seat {seat_id} has been booked.")
         else:
             messagebox.showerror("Error", f"Could not book seat {seat_id} (it might be already booked or invalid).")
-        self.update_seat_map()
 
     def free_seat(self):
         seat_id = self.seat_entry.get().strip()
@@ -163,11 +186,9 @@ class BookingSystemGUI:
             messagebox.showinfo("Success", f"Seat {seat_id} is now free.")
         else:
             messagebox.showerror("Error", f"Could not free seat {seat_id} (it might already be free or invalid).")
-        self.update_seat_map()
 
     def show_booking_status(self):
         all_seats_status = self.flight.get_all_seats_status()
-        status_text = "Seat Status:\n"
-        for seat_id, status in all_seats_status.items():
-            status_text += f"{seat_id}: {status}\n"
+        status_text = "Seat Status:\n" + "".join(
+            f"{seat_id}: {status}\n" for seat_id, status in all_seats_status.items())
         messagebox.showinfo("Booking Status", status_text)
@@ -1,38 +1,197 @@
-from seat import Seat
+from itertools import compress
+
+# Shared with the main application in the directory above, which must be on sys.path
+# (main.py puts it there)
+from seat_allocator import SeatAllocator, rows_from_seat_ids
+# A flight's seats are only ever free or booked; holds live in the database version
+from seat_status import BOOKED, FREE, STATUS_NAMES
+
+# Aisle split of the default seat map: A B | C D
+DEFAULT_SEAT_GROUPS = [["A", "B"], ["C", "D"]]
+
+
+class SeatView:
+    """
+    A live view of one seat of a Flight with the Seat interface: status and
+    passenger_name are read from the flight, and book()/free() change the flight
+    (and notify its listeners).
+    """
+    __slots__ = ("flight", "seat_id", "_i")
+
+    def __init__(self, flight, seat_id, i):
+        self.flight = flight
+        self.seat_id = seat_id
+        self._i = i
+
+    @property
+    def status(self):
+        return STATUS_NAMES[self.flight.status[self._i]]
+
+    @property
+    def passenger_name(self):
+        return self.flight.passenger_names.get(self._i)
+
+    def is_free(self):
+        return self.flight.status[self._i] == FREE
+
+    def book(self, passenger_name=None):
+        return self.flight.book_seat(self.seat_id, passenger_name)
+
+    def free(self):
+        return self.flight.free_seat(self.seat_id)
+
 
 class Flight:
-    
-    def __init__(self, flight_number="Burak757"):
+    """
+    Seats of one flight, kept compact enough to simulate whole schedules: seat ids in
+    cabin order, an id -> index map, a bytearray with one status byte per seat, and
+    passenger names only for the seats that have one.
+    """
+    def __init__(self, flight_number="Burak757", seat_ids=None, seat_groups=None):
+        # For simplicity, we use a small set of seats unless given the seat ids of a layout
+        if seat_ids is None:
+            seat_ids = ["1A", "1B", "2A", "2B", "3A", "3B"]
+            seat_groups = seat_groups or DEFAULT_SEAT_GROUPS
+        seat_ids = list(seat_ids)
+        self._init(flight_number, seat_ids, {seat_id: i for i, seat_id in enumerate(seat_ids)},
+                   dict.fromkeys(seat_ids, STATUS_NAMES[FREE]), seat_groups)
+
+    def _init(self, flight_number, seat_ids, index, all_free, seat_groups):
+        # seat_ids, index and all_free (the status map of an empty flight) are never
+        # modified, so flights of the same aircraft can share them
         self.flight_number = flight_number
-        # For simplicity, we use a small set of seats
-        seat_ids = ["1A", "1B", "2A", "2B", "3A", "3B"]
-        self.seats = {}
-        for seat_id in seat_ids:
-            self.seats[seat_id] = Seat(seat_id)
+        self.seat_ids = seat_ids
+        self.index = index
+        self._all_free = all_free
+        self.seat_groups = seat_groups
+        self.status = bytearray(len(seat_ids))
+        self.passenger_names = {}
+        self._listeners = []
+        # Free-run index for find_best_seats; built on first use, since most simulated
+        # flights never need it
+        self._allocator = None
+
+    def with_same_seats(self, flight_number):
+        """
+        A new, empty flight sharing this flight's seat ids and index, so a schedule of
+        identical aircraft stores them once.
+        """
+        flight = Flight.__new__(Flight)
+        flight._init(flight_number, self.seat_ids, self.index, self._all_free, self.seat_groups)
+        return flight
+
+    def add_listener(self, callback):
+        """
+        Register callback(seat_id, status), called whenever book_seat or free_seat
+        changes a seat.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, seat_id, status):
+        if self._allocator is not None:
+            self._allocator.set_free(seat_id, status == "free")
+        for callback in list(self._listeners):
+            callback(seat_id, status)
 
     def get_seat(self, seat_id):
-        return self.seats.get(seat_id)
+        """Returns a live SeatView of the seat, or None if there is no such seat."""
+        i = self.index.get(seat_id)
+        if i is None:
+            return None
+        return SeatView(self, seat_id, i)
+
+    @property
+    def seats(self):
+        """Dictionary of seat_id -> SeatView, in cabin order."""
+        return {seat_id: SeatView(self, seat_id, i) for i, seat_id in enumerate(self.seat_ids)}
 
     def check_availability(self, seat_id):
-        seat = self.get_seat(seat_id)
-        if seat:
-            return seat.is_free()
-        return None  # Means seat_id does not exist
+        i = self.index.get(seat_id)
+        if i is None:
+            return None  # Means seat_id does not exist
+        return self.status[i] == FREE
 
     def book_seat(self, seat_id, passenger_name=None):
-        seat = self.get_seat(seat_id)
-        if seat:
-            return seat.book(passenger_name)
-        return False
+        i = self.index.get(seat_id)
+        if i is None or self.status[i] != FREE:
+            return False
+        self.status[i] = BOOKED
+        if passenger_name is not None:
+            self.passenger_names[i] = passenger_name
+        self._notify(seat_id, "booked")
+        return True
 
     def free_seat(self, seat_id):
-        seat = self.get_seat(seat_id)
-        if seat:
-            return seat.free()
-        return False
+        i = self.index.get(seat_id)
+        if i is None or self.status[i] == FREE:
+            return False
+        self.status[i] = FREE
+        self.passenger_names.pop(i, None)
+        self._notify(seat_id, "free")
+        return True
+
+    def book_seats(self, seat_ids, passenger_name=None):
+        """
+        Book every free seat among seat_ids in one pass over the status array;
+        returns the ids that were booked. Listeners are told once all are applied.
+        """
+        index, status = self.index, self.status
+        booked = []
+        for seat_id in seat_ids:
+            i = index.get(seat_id)
+            if i is not None and status[i] == FREE:
+                status[i] = BOOKED
+                if passenger_name is not None:
+                    self.passenger_names[i] = passenger_name
+                booked.append(seat_id)
+        if self._listeners or self._allocator is not None:
+            for seat_id in booked:
+                self._notify(seat_id, "booked")
+        return booked
+
+    def free_seats(self, seat_ids):
+        """
+        Free every booked seat among seat_ids; returns the ids that were freed.
+        """
+        index, status = self.index, self.status
+        freed = []
+        for seat_id in seat_ids:
+            i = index.get(seat_id)
+            if i is not None and status[i] != FREE:
+                status[i] = FREE
+                self.passenger_names.pop(i, None)
+                freed.append(seat_id)
+        if self._listeners or self._allocator is not None:
+            for seat_id in freed:
+                self._notify(seat_id, "free")
+        return freed
+
+    def count_free(self):
+        return self.status.count(FREE)
+
+    def find_best_seats(self, n, preferences=None):
+        """
+        Returns ids of n free seats, adjacent in a row where possible (see SeatAllocator).
+        Needs seat_groups to know where the aisles are, unless the flight uses the
+        default seats; raises ValueError otherwise.
+        """
+        if self._allocator is None:
+            if self.seat_groups is None:
+                raise ValueError("find_best_seats needs the flight's seat_groups")
+            free = [seat_id for seat_id, code in zip(self.seat_ids, self.status) if code == FREE]
+            self._allocator = SeatAllocator(rows_from_seat_ids(self.seat_ids, self.seat_groups), free)
+        return self._allocator.find(n, preferences)
 
     def get_all_seats_status(self):
         """
         Returns a dictionary mapping seat_id to its status.
         """
-        return {seat_id: seat.status for seat_id, seat in self.seats.items()}
+        # Copy the all-free map and overwrite only the seats that are not free (all of them
+        # booked); compress() picks them out of the status bytes without a Python loop
+        statuses = self._all_free.copy()
+        for seat_id in compress(self.seat_ids, self.status):
+            statuses[seat_id] = STATUS_NAMES[BOOKED]
+        return statuses
@@ -1,5 +1,11 @@
+import os
+import sys
 import tkinter as tk
-from booking_systemGUI import BookingSystemGUI
+
+# flight.py uses the seat allocator and status codes of the main application in the
+# directory above
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from booking_systemGUI import BookingSystemGUI  # noqa: E402
 
 def main():
     root = tk.Tk()
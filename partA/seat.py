@@ -1,5 +1,7 @@
 class Seat:
-    
+    # No per-instance __dict__: a seat is three references
+    __slots__ = ("seat_id", "status", "passenger_name")
+
     def __init__(self, seat_id, status="free", passenger_name=None):
         self.seat_id = seat_id
         self.status = status
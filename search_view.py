@@ -0,0 +1,83 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Pause after the last keystroke before searching (milliseconds)
+SEARCH_DELAY_MS = 200
+# Results shown per search
+SEARCH_LIMIT = 50
+
+
+class PassengerSearchView:
+    """
+    Passenger search window: results update as the user types a name, passport number or
+    booking reference (see DatabaseManager.search_passengers). Queries run on the
+    DatabaseWorker; results of a query superseded by a newer one are dropped.
+    Double-clicking a result calls on_select(flight_number, seat_id).
+    """
+    def __init__(self, master, db_worker, on_select=None):
+        self.db_worker = db_worker
+        self.on_select = on_select
+        self._search_after_id = None
+        self._search_job = None
+        self._query_id = 0
+        self.window = tk.Toplevel(master)
+        self.window.title("Find Passenger")
+
+        top = tk.Frame(self.window)
+        top.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        tk.Label(top, text="Name, passport # or booking ref:").pack(side=tk.LEFT)
+        self.query_entry = tk.Entry(top, width=30)
+        self.query_entry.pack(side=tk.LEFT, padx=5)
+        self.query_entry.bind("<KeyRelease>", self._schedule_search)
+        self.query_entry.bind("<Return>", lambda event: self.search())
+        self.query_entry.focus_set()
+
+        columns = [("Booking Ref", 100), ("Flight", 90), ("Seat", 50), ("Passport", 100),
+                   ("Passenger", 180)]
+        self.tree = ttk.Treeview(self.window, columns=[name for name, _ in columns],
+                                 show="headings", height=15)
+        for name, width in columns:
+            self.tree.heading(name, text=name)
+            self.tree.column(name, width=width)
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.summary_label = tk.Label(self.window, text="")
+        self.summary_label.pack(side=tk.TOP, anchor=tk.W, padx=10, pady=5)
+
+    def _schedule_search(self, event=None):
+        # Coalesce keystrokes into one query once typing pauses
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        self._search_after_id = self.window.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        self._search_after_id = None
+        if self._search_job is not None:
+            self._search_job.cancel()  # no-op if it is already running; its result is dropped
+        self._query_id += 1
+        query_id = self._query_id
+        self._search_job = self.db_worker.submit(
+            "search_passengers", "search_passengers", (self.query_entry.get(), SEARCH_LIMIT),
+            callback=lambda rows: self._show_results(query_id, rows),
+            errback=lambda error: self._show_error(query_id, error))
+
+    def _show_results(self, query_id, rows):
+        if query_id != self._query_id or not self.window.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        for booking_ref, flight_number, seat_id, passport_num, first_name, last_name in rows:
+            self.tree.insert("", tk.END, values=(
+                booking_ref, flight_number, seat_id, passport_num or "",
+                " ".join(name for name in (first_name, last_name) if name)))
+        more = "+" if len(rows) == SEARCH_LIMIT else ""
+        self.summary_label.config(text=f"{len(rows)}{more} booking(s) found")
+
+    def _show_error(self, query_id, error):
+        if query_id == self._query_id and self.window.winfo_exists():
+            self.summary_label.config(text=f"Search failed: {error}")
+
+    def _on_double_click(self, event=None):
+        selection = self.tree.selection()
+        if selection and self.on_select is not None:
+            values = self.tree.item(selection[0], "values")
+            self.on_select(values[1], values[2])
@@ -0,0 +1,166 @@
+import bisect
+
+# Kinds of seat at the end of a seat group
+WINDOW = "window"
+AISLE = "aisle"
+
+
+class SeatAllocator:
+    """
+    Finds the best free seats for a party of n passengers.
+
+    Seats are organised as groups: the seats of one row between two aisles (or an aisle and
+    a window). For every group the allocator keeps its longest run of adjacent free seats,
+    and for every run length a sorted list of the groups with that longest run. A request
+    for n adjacent seats therefore only looks at the groups whose longest run is at least n,
+    starting with the tightest fit, instead of walking the whole cabin.
+
+    preferences (all optional):
+      "position": "window" or "aisle" - prefer a block that includes such a seat
+      "split": False to return [] rather than splitting the party across groups
+    """
+    def __init__(self, rows, free_seats):
+        """
+        rows: iterable of (row_number, groups), groups being lists of seat letters ordered
+        left to right, e.g. (1, [["A", "B"], ["C", "D"]]). free_seats: ids of the free seats.
+        """
+        free_seats = set(free_seats)
+        # Per group: row number, seat ids, free flags, and the kind of seat at each end
+        self._group_seats = []
+        self._group_free = []
+        self._group_ends = []
+        self._longest = []
+        self._by_run = {}
+        self._seat_group = {}
+        self.free_count = 0
+        for row, groups in rows:
+            for g, letters in enumerate(groups):
+                gi = len(self._group_seats)
+                seat_ids = [f"{row}{letter}" for letter in letters]
+                self._group_seats.append(seat_ids)
+                self._group_free.append(bytearray(seat_id in free_seats for seat_id in seat_ids))
+                self._group_ends.append((WINDOW if g == 0 else AISLE,
+                                         WINDOW if g == len(groups) - 1 else AISLE))
+                for pos, seat_id in enumerate(seat_ids):
+                    self._seat_group[seat_id] = (gi, pos)
+                self.free_count += sum(self._group_free[gi])
+                self._longest.append(0)
+                self._reindex(gi)
+
+    def _runs(self, gi):
+        """(start, length) of each run of free seats in a group."""
+        runs = []
+        start = None
+        flags = self._group_free[gi]
+        for pos, free in enumerate(flags):
+            if free and start is None:
+                start = pos
+            elif not free and start is not None:
+                runs.append((start, pos - start))
+                start = None
+        if start is not None:
+            runs.append((start, len(flags) - start))
+        return runs
+
+    def _reindex(self, gi):
+        old = self._longest[gi]
+        new = max((length for _, length in self._runs(gi)), default=0)
+        if old:
+            groups = self._by_run[old]
+            del groups[bisect.bisect_left(groups, gi)]
+        if new:
+            bisect.insort(self._by_run.setdefault(new, []), gi)
+        self._longest[gi] = new
+
+    def set_free(self, seat_id, free):
+        """Record that a seat was booked (free=False) or freed (free=True)."""
+        location = self._seat_group.get(seat_id)
+        if location is None:
+            return
+        gi, pos = location
+        if self._group_free[gi][pos] != free:
+            self._group_free[gi][pos] = free
+            self.free_count += 1 if free else -1
+            self._reindex(gi)
+
+    def _placement(self, gi, n, position):
+        """Start of an n-seat block in group gi that includes a `position` seat, or None."""
+        left_end, right_end = self._group_ends[gi]
+        width = len(self._group_free[gi])
+        for start, length in self._runs(gi):
+            if length < n:
+                continue
+            if position is None:
+                return start
+            if start == 0 and left_end == position:
+                return 0
+            if start + length == width and right_end == position:
+                return width - n
+        return None
+
+    def find(self, n, preferences=None):
+        """Seat ids for n passengers, adjacent where possible; [] if it cannot be satisfied."""
+        preferences = preferences or {}
+        if n <= 0 or n > self.free_count:
+            return []
+        position = preferences.get("position")
+        fallback = None
+        for length in sorted(k for k in self._by_run if k >= n):
+            for gi in self._by_run[length]:
+                start = self._placement(gi, n, position)
+                if start is not None:
+                    return self._group_seats[gi][start:start + n]
+                if fallback is None:
+                    fallback = gi
+            if position is None:
+                break
+        if fallback is not None:
+            start = self._placement(fallback, n, None)
+            return self._group_seats[fallback][start:start + n]
+        if preferences.get("split", True):
+            return self._split(n)
+        return []
+
+    def _split(self, n):
+        """Fill the party from the largest free runs first, keeping sub-groups together."""
+        seats = []
+        for length in sorted(self._by_run, reverse=True):
+            for gi in self._by_run[length]:
+                for start, run in self._runs(gi):
+                    take = min(run, n - len(seats))
+                    seats += self._group_seats[gi][start:start + take]
+                    if len(seats) == n:
+                        return seats
+        return seats
+
+
+def split_seat_id(seat_id):
+    """Split "12C" into (12, "C")."""
+    digits = len(seat_id) - len(seat_id.lstrip("0123456789"))
+    return int(seat_id[:digits]), seat_id[digits:]
+
+
+def rows_from_seat_ids(seat_ids, seat_groups):
+    """
+    Build SeatAllocator rows from seat ids. seat_groups (e.g. [["A", "B"], ["C", "D"]])
+    gives the aisle split used for every row; letters missing from a row are skipped.
+    """
+    letters_by_row = {}
+    for seat_id in seat_ids:
+        row, letter = split_seat_id(seat_id)
+        letters_by_row.setdefault(row, set()).add(letter)
+    rows = []
+    for row, present in letters_by_row.items():
+        groups = [[letter for letter in group if letter in present] for group in seat_groups]
+        rows.append((row, [group for group in groups if group]))
+    return rows
+
+
+def rows_from_layout(layout):
+    """Build SeatAllocator rows from an AircraftLayout's cabins (blocked seats left out)."""
+    rows = []
+    for row in sorted(layout.row_cabin):
+        groups = [[letter for letter in group if f"{row}{letter}" in layout]
+                  for group in layout.groups(row)]
+        rows.append((row, [group for group in groups if group]))
+    return rows
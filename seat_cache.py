@@ -0,0 +1,198 @@
+from database_manager import DEFAULT_FLIGHT, HOLD_TTL_SECONDS, OUTCOME_UNAVAILABLE
+from seat_status import STATUS_CODES, STATUS_NAMES
+
+
+class FlightSeats:
+    """
+    Seat state for one flight: seat ids in cabin order, an id -> index map,
+    a bytearray holding one status code per seat, and the layout they were seeded from.
+    """
+    __slots__ = ("seat_ids", "index", "status", "layout_key")
+
+    def __init__(self, rows, layout_key=None):
+        self.layout_key = layout_key
+        self.seat_ids = [seat_id for seat_id, _ in rows]
+        self.index = {seat_id: i for i, seat_id in enumerate(self.seat_ids)}
+        self.status = bytearray(STATUS_CODES[status] for _, status in rows)
+
+    def get(self, seat_id):
+        i = self.index.get(seat_id)
+        if i is None:
+            return None
+        return STATUS_NAMES[self.status[i]]
+
+    def set(self, seat_id, status):
+        i = self.index.get(seat_id)
+        if i is not None:
+            self.status[i] = STATUS_CODES[status]
+
+    def items(self):
+        return zip(self.seat_ids, map(STATUS_NAMES.__getitem__, self.status))
+
+
+class SeatCache:
+    """
+    In-memory seat state in front of a DatabaseManager.
+    Reads are answered from memory; mutations are written through to SQLite and
+    applied to the cache from the manager's change events. Changes committed by other
+    connections are picked up by sync(): when SQLite's `PRAGMA data_version` differs
+    from the last value seen, it reads the booking_events written since the last event
+    it applied, so only the seats that changed are looked at. Anything else is delegated
+    to the wrapped DatabaseManager.
+
+    Listeners registered with add_listener() hear about both kinds of change.
+    """
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._flights = {}
+        self._listeners = []
+        # Read when the first flight is loaded, so creating the cache does not connect
+        self._data_version = None
+        self._event_id = None
+        self.db_manager.add_listener(self._on_seat_changed)
+
+    def __getattr__(self, name):
+        return getattr(self.db_manager, name)
+
+    def _read_data_version(self):
+        return self.db_manager.conn.execute("PRAGMA data_version;").fetchone()[0]
+
+    def _start_tracking(self):
+        # Both are read together: sync() applies events after _event_id once data_version
+        # moves past _data_version. The version is read first, so a commit in between is
+        # seen again rather than missed.
+        if self._event_id is None:
+            self._data_version = self._read_data_version()
+            self._event_id = self.db_manager.last_event_id()
+
+    def _flight(self, flight_number):
+        seats = self._flights.get(flight_number)
+        if seats is None:
+            self._start_tracking()
+            seats = self._load(flight_number)
+            self._flights[flight_number] = seats
+        return seats
+
+    def _load(self, flight_number):
+        return FlightSeats(self.db_manager.get_all_seats(flight_number),
+                           self.db_manager.get_layout_key(flight_number))
+
+    def add_listener(self, callback):
+        """Register callback(flight_number, seat_id, status) for every seat status change."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, flight_number, seat_id, status):
+        for callback in list(self._listeners):
+            callback(flight_number, seat_id, status)
+
+    def apply(self, flight_number, seat_id, status):
+        """
+        Record a status change committed through another connection (e.g. a background
+        worker's), without waiting for sync() to notice it.
+        """
+        self._on_seat_changed(flight_number, seat_id, status)
+
+    def _on_seat_changed(self, flight_number, seat_id, status):
+        seats = self._flights.get(flight_number)
+        if seats is not None:
+            seats.set(seat_id, status)
+        self._notify(flight_number, seat_id, status)
+
+    def invalidate(self, flight_number=None):
+        """Drop cached state for one flight, or for every flight when None."""
+        if flight_number is None:
+            self._flights.clear()
+        else:
+            self._flights.pop(flight_number, None)
+
+    def sync(self):
+        """
+        Apply changes committed by other connections since the last check.
+        Returns True when there were any.
+        """
+        if self._event_id is None:
+            # Nothing is cached yet; flights loaded from now on are current
+            self._start_tracking()
+            return False
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        changes = self.db_manager.seat_changes_since(self._event_id)
+        if changes:
+            self._event_id = changes[-1][0]
+        # A flight reseeded from another layout has a different set of seats
+        reload = {flight_number for flight_number, seats in self._flights.items()
+                  if self.db_manager.get_layout_key(flight_number) != seats.layout_key}
+        for _, flight_number, seat_id, status in changes:
+            seats = self._flights.get(flight_number)
+            if seats is None or flight_number in reload:
+                continue
+            if seat_id not in seats.index:
+                reload.add(flight_number)
+            elif seats.get(seat_id) != status:
+                # Changes made through this process (e.g. by the worker) are already applied
+                seats.set(seat_id, status)
+                self._notify(flight_number, seat_id, status)
+        for flight_number in reload:
+            self._reload(flight_number)
+        return True
+
+    def _reload(self, flight_number):
+        old = self._flights[flight_number]
+        new = self._flights[flight_number] = self._load(flight_number)
+        if not self._listeners:
+            return
+        if new.seat_ids != old.seat_ids:
+            changed = range(len(new.seat_ids))
+        else:
+            changed = [i for i, (a, b) in enumerate(zip(old.status, new.status)) if a != b]
+        for i in changed:
+            self._notify(flight_number, new.seat_ids[i], STATUS_NAMES[new.status[i]])
+
+    def get_seat_status(self, seat_id, flight_number=DEFAULT_FLIGHT):
+        return self._flight(flight_number).get(seat_id)
+
+    def get_all_seats(self, flight_number=DEFAULT_FLIGHT):
+        return list(self._flight(flight_number).items())
+
+    def insert_seats(self, seats, flight_number=DEFAULT_FLIGHT):
+        self.db_manager.insert_seats(seats, flight_number)
+        self.invalidate(flight_number)
+
+    def insert_seat(self, seat_id, seat_row, seat_col, flight_number=DEFAULT_FLIGHT):
+        self.insert_seats([(seat_id, seat_row, seat_col)], flight_number)
+
+    def update_bookings(self, bookings, flight_number=DEFAULT_FLIGHT):
+        self.db_manager.update_bookings(bookings, flight_number)
+
+    def update_seat_booking(self, seat_id, booking_ref, passport_num, first_name, last_name, status,
+                            flight_number=DEFAULT_FLIGHT):
+        self.update_bookings([(seat_id, booking_ref, passport_num, first_name, last_name, status)],
+                             flight_number)
+
+    def book_seat_atomic(self, seat_id, passport_num=None, first_name=None, last_name=None,
+                         flight_number=DEFAULT_FLIGHT, hold_token=None):
+        outcome, booking_ref = self.db_manager.book_seat_atomic(
+            seat_id, passport_num, first_name, last_name, flight_number, hold_token)
+        self._check_outcome(outcome, flight_number)
+        return outcome, booking_ref
+
+    def hold_seat_atomic(self, seat_id, ttl=HOLD_TTL_SECONDS, flight_number=DEFAULT_FLIGHT):
+        outcome, hold_token = self.db_manager.hold_seat_atomic(seat_id, ttl, flight_number)
+        self._check_outcome(outcome, flight_number)
+        return outcome, hold_token
+
+    def free_seat_atomic(self, seat_id, flight_number=DEFAULT_FLIGHT):
+        outcome = self.db_manager.free_seat_atomic(seat_id, flight_number)
+        self._check_outcome(outcome, flight_number)
+        return outcome
+
+    def _check_outcome(self, outcome, flight_number):
+        # Successful changes reach the cache through _on_seat_changed. A refusal means the
+        # database disagreed with what the caller saw, so fetch any external changes now.
+        if outcome == OUTCOME_UNAVAILABLE:
+            self.sync()
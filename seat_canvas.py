@@ -0,0 +1,133 @@
+import tkinter as tk
+
+
+class CanvasSeatMap:
+    """
+    Seat map drawn on a single tk.Canvas, for cabins too large for one button per seat.
+
+    Cells follow the layout's precomputed grid (column 0 = row labels, one header row per
+    cabin). Only the grid rows inside the scrolled viewport have canvas items; rows are
+    drawn as they scroll into view and deleted as they leave it. Clicks are hit-tested
+    arithmetically from the cell size, and on_click(seat_id) is called for seat cells.
+    """
+    def __init__(self, master, layout, on_click, colors, unknown_colors,
+                 cell_width=52, cell_height=30, height=600):
+        self.layout = layout
+        self.on_click = on_click
+        self.colors = colors
+        self.unknown_colors = unknown_colors
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.statuses = {}
+
+        # Seat indices per grid row, and the seat in each (grid_row, grid_col) cell
+        self._row_seats = {}
+        self._cell_seat = {}
+        for i, seat_id in enumerate(layout.seat_ids):
+            cell = (layout.grid_rows[i], layout.grid_cols[i])
+            self._row_seats.setdefault(cell[0], []).append(i)
+            self._cell_seat[cell] = seat_id
+        self._row_label = dict(layout.row_labels)
+        self._header = dict(layout.headers)
+
+        # grid_row -> canvas item ids drawn for it; seat_id -> (rect, text) while visible
+        self._drawn_rows = {}
+        self._seat_items = {}
+        self._render_pending = False
+
+        self.frame = tk.Frame(master, bd=2, relief=tk.SUNKEN)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL)
+        self.canvas = tk.Canvas(
+            self.frame, width=layout.grid_width * cell_width,
+            height=min(height, layout.grid_height * cell_height),
+            scrollregion=(0, 0, layout.grid_width * cell_width, layout.grid_height * cell_height),
+            yscrollcommand=self._on_yscroll)
+        self.scrollbar.config(command=self.canvas.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.canvas.yview_scroll(-3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.canvas.yview_scroll(3, "units"))
+        self.schedule_render()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_statuses(self, statuses):
+        """Replace all seat statuses (seat_id -> status) and repaint the visible seats."""
+        self.statuses = dict(statuses)
+        for seat_id in self._seat_items:
+            self._paint(seat_id)
+
+    def set_status(self, seat_id, status):
+        self.statuses[seat_id] = status
+        if seat_id in self._seat_items:
+            self._paint(seat_id)
+
+    def _paint(self, seat_id):
+        rect, text = self._seat_items[seat_id]
+        bg, fg = self.colors.get(self.statuses.get(seat_id), self.unknown_colors)
+        self.canvas.itemconfig(rect, fill=bg)
+        self.canvas.itemconfig(text, fill=fg)
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_render()
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def schedule_render(self):
+        # Scrolling fires many yscroll callbacks; render once when Tk is idle
+        if not self._render_pending:
+            self._render_pending = True
+            self.canvas.after_idle(self.render)
+
+    def visible_rows(self):
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(self.canvas.winfo_height())
+        first = max(0, int(top // self.cell_height))
+        last = min(self.layout.grid_height - 1, int(bottom // self.cell_height))
+        return range(first, last + 1)
+
+    def render(self):
+        """Draw the grid rows in the viewport and drop the ones that scrolled out of it."""
+        self._render_pending = False
+        visible = self.visible_rows()
+        for grid_row in [r for r in self._drawn_rows if r not in visible]:
+            self.canvas.delete(*self._drawn_rows.pop(grid_row))
+            for i in self._row_seats.get(grid_row, ()):
+                del self._seat_items[self.layout.seat_ids[i]]
+        for grid_row in visible:
+            if grid_row not in self._drawn_rows:
+                self._drawn_rows[grid_row] = self._draw_row(grid_row)
+
+    def _draw_row(self, grid_row):
+        w, h = self.cell_width, self.cell_height
+        y = grid_row * h
+        items = []
+        if grid_row in self._header:
+            for grid_col, text in self._header[grid_row]:
+                items.append(self.canvas.create_text(grid_col * w + w / 2, y + h / 2, text=text,
+                                                     font=("Arial", 10, "bold")))
+        if grid_row in self._row_label:
+            items.append(self.canvas.create_text(w / 2, y + h / 2, text=str(self._row_label[grid_row]),
+                                                 font=("Arial", 10, "bold")))
+        for i in self._row_seats.get(grid_row, ()):
+            seat_id = self.layout.seat_ids[i]
+            x = self.layout.grid_cols[i] * w
+            rect = self.canvas.create_rectangle(x + 2, y + 2, x + w - 2, y + h - 2, outline="black")
+            text = self.canvas.create_text(x + w / 2, y + h / 2, text=seat_id)
+            items += [rect, text]
+            self._seat_items[seat_id] = (rect, text)
+            self._paint(seat_id)
+        return items
+
+    def _on_click(self, event):
+        cell = (int(self.canvas.canvasy(event.y) // self.cell_height),
+                int(self.canvas.canvasx(event.x) // self.cell_width))
+        seat_id = self._cell_seat.get(cell)
+        if seat_id is not None:
+            self.on_click(seat_id)
@@ -0,0 +1,9 @@
+"""
+Seat status codes for the in-memory seat stores (SeatCache, and Flight in partA), which
+keep one status byte per seat: the byte is the status's index in STATUS_NAMES.
+"""
+STATUS_NAMES = ["free", "booked", "held"]
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+FREE = STATUS_CODES["free"]
+BOOKED = STATUS_CODES["booked"]
+HELD = STATUS_CODES["held"]
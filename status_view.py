@@ -0,0 +1,141 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Rows fetched per page by the paginated tables
+PAGE_SIZE = 100
+
+
+class PagedTable:
+    """
+    A scrollable ttk.Treeview fed one page at a time.
+    fetch_page(after, limit, callback, errback) requests a page and later calls
+    callback(rows) (or errback(error)) on the Tk thread; key(row) gives the `after` value
+    for the next page and values(row) the displayed cells. The next page is requested when
+    the view is scrolled to the bottom (or with the "Load more" button), so opening the
+    table costs one page however many rows exist.
+    """
+    def __init__(self, master, columns, fetch_page, key, values, height=15):
+        self.fetch_page = fetch_page
+        self.key = key
+        self.values = values
+        self.after = None
+        self.exhausted = False
+        self.loading = False
+
+        self.frame = tk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _ in columns],
+                                 show="headings", height=height)
+        for name, width in columns:
+            self.tree.heading(name, text=name)
+            self.tree.column(name, width=width)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.config(yscrollcommand=self._on_yscroll)
+        self.more_button = tk.Button(self.frame, text="Load more", command=self.load_page)
+        self.more_button.pack(side=tk.BOTTOM, fill=tk.X)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.load_page()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def load_page(self):
+        if self.exhausted or self.loading:
+            return
+        self.loading = True
+        self.fetch_page(self.after, PAGE_SIZE, self._on_page, self._on_error)
+
+    def _on_page(self, rows):
+        self.loading = False
+        if not self.tree.winfo_exists():
+            return  # the window was closed while the page was being fetched
+        for row in rows:
+            self.tree.insert("", tk.END, values=self.values(row))
+        if len(rows) < PAGE_SIZE:
+            self.exhausted = True
+            self.more_button.config(state=tk.DISABLED)
+        if rows:
+            self.after = self.key(rows[-1])
+
+    def _on_error(self, error):
+        # Leave "Load more" enabled so the page can be requested again
+        self.loading = False
+        if self.tree.winfo_exists():
+            self.more_button.config(text=f"Load more (failed: {error})")
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= 1.0 and not self.exhausted:
+            self.tree.after_idle(self.load_page)
+
+
+class StatusView:
+    """
+    Booking status window: seat counts by status and by cabin for one flight (aggregated
+    in SQL), its seats page by page, and occupancy of every flight page by page.
+    Every query runs on the DatabaseWorker; the window opens at once and fills in as
+    the results arrive.
+    """
+    def __init__(self, master, db_worker, flight_number, layout=None):
+        self.db_worker = db_worker
+        self.flight_number = flight_number
+        self.layout = layout
+        self.window = tk.Toplevel(master)
+        self.window.title(f"Booking Status - {flight_number}")
+
+        self._summary = [f"Flight {flight_number}: loading..."]
+        self._cabins = []
+        self.summary_label = tk.Label(self.window, text=self._summary[0], justify=tk.LEFT)
+        self.summary_label.pack(side=tk.TOP, anchor=tk.W, padx=10, pady=5)
+        db_worker.submit("count_by_status", "count_by_status", (flight_number,),
+                         callback=self._on_counts, errback=self._on_error)
+        if layout is not None:
+            db_worker.submit("count_by_row", "count_by_row", (flight_number,),
+                             callback=self._on_row_counts, errback=self._on_error)
+
+        self.seats_table = PagedTable(
+            self.window, [("Seat", 60), ("Status", 80), ("Booking Ref", 100), ("Passenger", 180)],
+            lambda after, limit, callback, errback: db_worker.submit(
+                "page_seats", "page_seats", (flight_number, after, limit), callback, errback),
+            key=lambda row: row[:2],
+            values=lambda row: (row[2], row[3], row[4] or "",
+                                " ".join(name for name in row[5:7] if name)))
+        self.seats_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.flights_table = PagedTable(
+            self.window, [("Flight", 100), ("Seats", 60), ("Booked", 60), ("Occupancy", 80)],
+            lambda after, limit, callback, errback: db_worker.submit(
+                "page_occupancy", "page_occupancy", (after, limit), callback, errback),
+            key=lambda row: row[0],
+            values=lambda row: (row[0], row[1], row[2], f"{row[2] / row[1]:.0%}" if row[1] else "-"))
+        self.flights_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def _show_summary(self):
+        if self.window.winfo_exists():
+            self.summary_label.config(text="\n".join(self._summary + self._cabins))
+
+    def _on_counts(self, counts):
+        total = sum(counts.values())
+        self._summary = [f"Flight {self.flight_number}: {total} seats, " +
+                         ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))]
+        self._show_summary()
+
+    def _on_row_counts(self, row_counts):
+        self._cabins = self._cabin_summary(row_counts, self.layout)
+        self._show_summary()
+
+    def _on_error(self, error):
+        self._summary = [f"Flight {self.flight_number}: could not load counts ({error})"]
+        self._show_summary()
+
+    @staticmethod
+    def _cabin_summary(row_counts, layout):
+        """Fold per-row counts into one line per cabin."""
+        cabins = {}
+        for seat_row, status, n in row_counts:
+            cabin = layout.row_cabin.get(seat_row)
+            name = cabin.name if cabin is not None else "Other"
+            cabins.setdefault(name, {})
+            cabins[name][status] = cabins[name].get(status, 0) + n
+        return [f"  {name}: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+                for name, counts in cabins.items()]